@@ -0,0 +1,75 @@
+"""Benchmark of the CSV writers of the t1_generators module.
+
+The original row by row writer (one random_word, random_date and
+random_bool call and one write call per row) is compared with
+write_into_csv in one process and with a process pool. The result
+is printed in rows per second.
+
+The original row helpers are copied here, because the helpers of
+t1_generators use the faster date sampling now.
+"""
+import os
+import random
+import datetime
+import tempfile
+import time
+import t1_generators as t1
+
+def random_word(n=8) -> str:
+    """The original implementation of random_word."""
+    if not isinstance(n, int) or n <= 0:
+        raise ValueError("n must be a positive integer")
+    return ''.join(random.choices('abcdefghijklmnopqrstuvwxyz', k=n))
+
+def random_date() -> str:
+    """The original implementation of random_date."""
+    year = random.randint(1900, 2025)
+    month = random.randint(1, 12)
+    if month in [4, 6, 9, 11]:
+        day = random.randint(1, 30)
+    elif month == 2:
+        # The original checked only year % 4 and crashed on 1900-02-29
+        if year % 4 == 0 and year != 1900:
+            day = random.randint(1, 29)
+        else:
+            day = random.randint(1, 28)
+    else:
+        day = random.randint(1, 31)
+    return str(datetime.datetime(year, month, day)).removesuffix(' 00:00:00')
+
+def random_bool() -> str:
+    """The original implementation of random_bool."""
+    return str(random.choice([True, False]))
+
+def write_into_csv_rowwise(filename, num_rows: int, word_length=8) -> None:
+    """The original implementation of write_into_csv."""
+    with open(filename, mode='w', encoding='utf-8') as file:
+        for i in range(1, num_rows + 1):
+            line = f'"{i}", "{random_word(word_length)}", "{random_date()}", "{random_bool()}"'
+            file.write(line + '\n')
+
+def rows_per_second(writer, num_rows: int, **kwargs) -> float:
+    """Writes num_rows rows with the writer into a temporary file and
+    returns the number of rows written per second.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        writer(os.path.join(directory, 'bench.csv'), num_rows, **kwargs)
+        return num_rows / (time.perf_counter() - start)
+
+def main():
+    """The main function of the module"""
+    num_rows = 200_000
+    workers = max(os.cpu_count() or 1, 2)
+
+    results = {
+        'row by row': rows_per_second(write_into_csv_rowwise, num_rows),
+        'chunked': rows_per_second(t1.write_into_csv, num_rows),
+        f'chunked, {workers} workers': rows_per_second(t1.write_into_csv, num_rows,
+                                                       workers=workers),
+    }
+    for name, rate in results.items():
+        print(f'{name:<25}{rate:>15,.0f} rows/s')
+
+if __name__ == '__main__':
+    main()
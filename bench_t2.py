@@ -0,0 +1,76 @@
+"""Benchmark of the functions of the t2_lambdas module.
+
+The original lambda_3 (searching every element in a list) is compared
+with the methods of intersect for lists of integers of different sizes.
+lambda_1 and lambda_2 are compared with the word feature functions and
+lambda_4 with sort_by_last_char on a list of random words. The results
+are printed in milliseconds.
+"""
+import random
+import timeit
+import numpy as np
+import t2_lambdas as t2
+
+def best_time(func, repeat=5) -> float:
+    """Returns the best time of repeat calls of func in milliseconds."""
+    return min(timeit.repeat(func, number=1, repeat=repeat)) * 1000
+
+def bench_intersect():
+    """Prints the times of the intersections for lists of different sizes."""
+    def lambda_3(x, y):
+        return [element for element in x if element in y]
+
+    print(f"{'size':>10}{'lambda_3':>12}{'hash':>12}{'sorted':>12}{'numpy':>12}")
+    for size in (100, 1_000, 10_000, 100_000, 1_000_000):
+        x = [random.randrange(2 * size) for _ in range(size)]
+        y = [random.randrange(2 * size) for _ in range(size)]
+        x_array, y_array = np.array(x), np.array(y)
+        times = [best_time(lambda: lambda_3(x, y), repeat=1) if size <= 10_000 else None,
+                 best_time(lambda: t2.intersect(x, y)),
+                 best_time(lambda: t2.intersect(x, y, method='sorted')),
+                 best_time(lambda: t2.intersect(x_array, y_array, method='numpy'))]
+        print(f'{size:>10,}' + ''.join('{:>12}'.format('-' if t is None else f'{t:.2f}')
+                                      for t in times))
+
+def random_words(num_words: int, min_length=1) -> list[str]:
+    """Returns num_words random words with min_length to 12 characters."""
+    letters = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ'
+    return [''.join(random.choices(letters, k=random.randint(min_length, 12)))
+            for _ in range(num_words)]
+
+def bench_word_features(num_words=1_000_000):
+    """Prints the times of the word feature extraction for num_words words."""
+    words = random_words(num_words)
+    results = {
+        'lambda_1': lambda: t2.lambda_1()(words),
+        'lambda_2': lambda: t2.lambda_2()(words),
+        'word_features (rows)': lambda: list(t2.word_features(words)),
+        'word_feature_columns': lambda: t2.word_feature_columns(words),
+        'word_feature_batches': lambda: list(t2.word_feature_batches(iter(words))),
+    }
+    print(f'\n{num_words:,} words')
+    for name, func in results.items():
+        print(f'{name:<25}{best_time(func, repeat=3):>12.2f}')
+
+def bench_sort_by_last_char(num_words=1_000_000):
+    """Prints the times of sorting num_words words by their last character."""
+    words = random_words(num_words, min_length=0)
+    array = np.array(words)
+    results = {
+        'lambda_4': lambda: t2.lambda_4()(words),
+        'sort_by_last_char (bucket)': lambda: t2.sort_by_last_char(words),
+        'sort_by_last_char (numpy)': lambda: t2.sort_by_last_char(array, method='numpy'),
+    }
+    print(f'\n{num_words:,} words with empty words')
+    for name, func in results.items():
+        print(f'{name:<30}{best_time(func, repeat=3):>8.2f}')
+
+def main():
+    """The main function of the module"""
+    random.seed(0)
+    bench_intersect()
+    bench_word_features()
+    bench_sort_by_last_char()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Benchmark of the anonimization functions of the t3_anonimize_json module.
+
+The original recursive anonimize_name is compared with the iterative
+anonimize on the users in data.json. Every run anonimizes a fresh copy
+of the data, the copying is not measured.
+
+The output styles and backends of dump_json are compared by the time
+needed to write data.json and the size of the written file.
+"""
+import gc
+import os
+import json
+import time
+import tempfile
+import t3_anonimize_json as t3
+
+def anonimize_name_recursive(x):
+    """The original implementation of anonimize_name."""
+    if isinstance(x, dict):
+        if 'name' in x:
+            x['name'] = None
+        for key in x:
+            anonimize_name_recursive(x[key])
+    elif isinstance(x, list):
+        for item in x:
+            anonimize_name_recursive(item)
+
+def best_time(func, text: str, repeat=50) -> float:
+    """Returns the best time of repeat runs of func on the data in the json text."""
+    copies = [json.loads(text) for _ in range(repeat)]
+    times = []
+    # Like timeit the garbage collector is disabled during the measurement
+    gc.disable()
+    try:
+        for data in copies:
+            start = time.perf_counter()
+            func(data)
+            times.append(time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return min(times)
+
+def dump_time_and_size(data, style: str, backend: str, repeat=20) -> tuple[float, int]:
+    """Returns the best time of repeat dump_json calls and the size of the file."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bench.json')
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            t3.dump_json(data, path, style, backend)
+            times.append(time.perf_counter() - start)
+        return min(times), os.path.getsize(path)
+
+def main():
+    """The main function of the module"""
+    with open('data.json', mode='r', encoding='utf-8') as file:
+        text = file.read()
+
+    results = {
+        'recursive anonimize_name': best_time(anonimize_name_recursive, text),
+        'iterative anonimize': best_time(t3.anonimize, text),
+    }
+    for name, seconds in results.items():
+        print(f'{name:<30}{seconds * 1000:>10.2f} ms')
+
+    print(f"\n{'data.json':<30}{'':>10}{os.path.getsize('data.json'):>12,} bytes")
+    data = json.loads(text)
+    backends = ['json'] + (['orjson'] if t3.orjson is not None else [])
+    for style in ('pretty', 'compact', 'jsonl'):
+        for backend in backends if style != 'pretty' else ['json']:
+            seconds, size = dump_time_and_size(data, style, backend)
+            print(f'{style + ", " + backend:<30}{seconds * 1000:>7.2f} ms{size:>12,} bytes')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""Benchmark of the arithmetic of the Distance class of the t7_op_overloading module.
+
+The original Distance with four validated attributes is compared with the
+__slots__ Distance which stores only the total milimeters. Every benchmark
+is run a few times and the best time is reported as operations per second.
+
+The sum of the distances with a loop of += is also compared with the sum
+and the elementwise addition of a DistanceArray.
+"""
+import gc
+import sys
+import time
+import t7_op_overloading as t7
+
+class LegacyDistance:
+    """The original implementation of Distance."""
+    def __init__(self, meters: int, centimeters: int, milimeters: int):
+        self.meters = meters
+        self.centimeters = centimeters
+        self.milimeters = milimeters
+        self._distribute()
+
+    def _distribute(self):
+        self.meters = self.meters + (self.centimeters + self.milimeters // 10) // 100
+        self.centimeters = (self.centimeters + self.milimeters // 10) % 100
+        self.milimeters = self.milimeters % 10
+        self.total_milimeters = self.meters * 1000 + self.centimeters * 10 + self.milimeters
+
+    @property
+    def meters(self):
+        return self._meters
+
+    @meters.setter
+    def meters(self, value):
+        if not isinstance(value, int) or value < 0:
+            raise ValueError("meters, centimeters and milimeters must be non-negative integers")
+        self._meters = value
+
+    @property
+    def centimeters(self):
+        return self._centimeters
+
+    @centimeters.setter
+    def centimeters(self, value):
+        if not isinstance(value, int) or value < 0:
+            raise ValueError("meters, centimeters and milimeters must be non-negative integers")
+        self._centimeters = value
+
+    @property
+    def milimeters(self):
+        return self._milimeters
+
+    @milimeters.setter
+    def milimeters(self, value):
+        if not isinstance(value, int) or value < 0:
+            raise ValueError("meters, centimeters and milimeters must be non-negative integers")
+        self._milimeters = value
+
+    def __add__(self, other):
+        result = LegacyDistance(0,0,0)
+        result.milimeters = self.total_milimeters + other.total_milimeters
+        result._distribute()
+        return result
+
+    def __iadd__(self, other):
+        self.milimeters += other.total_milimeters
+        self._distribute()
+        return self
+
+    def __sub__(self, other):
+        result = LegacyDistance(0,0,0)
+        try:
+            result.milimeters = self.total_milimeters - other.total_milimeters
+        except ValueError as exc:
+            raise ValueError("Resulting distance cannot be negative") from exc
+        result._distribute()
+        return result
+
+def best_rate(func, distances, repeat=5) -> float:
+    """Returns the best number of operations per second of repeat runs of
+    func over the distances."""
+    times = []
+    # Like timeit the garbage collector is disabled during the measurement
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func(distances)
+            times.append(time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return len(distances) / min(times)
+
+def add_all(distances):
+    """Adds the distances with +."""
+    total = distances[0]
+    for distance in distances:
+        total = total + distance
+
+def iadd_all(distances):
+    """Adds the distances with +=."""
+    total = distances[0] + distances[0]
+    for distance in distances:
+        total += distance
+
+def sub_all(distances):
+    """Subtracts every distance from a longer distance."""
+    longest = type(distances[0])(10, 0, 0)
+    for distance in distances:
+        longest - distance
+
+def main(n=200_000):
+    """The main function of the module"""
+    print(f"{'':<12}{'legacy':>14}{'slots':>14}{'speedup':>10}")
+    legacy = [LegacyDistance(i % 7, i % 130, i % 15) for i in range(n)]
+    slots = [t7.Distance(i % 7, i % 130, i % 15) for i in range(n)]
+    for name, func in (('add', add_all), ('iadd', iadd_all), ('sub', sub_all)):
+        old, new = best_rate(func, legacy), best_rate(func, slots)
+        print(f"{name:<12}{old:>10,.0f}/s {new:>10,.0f}/s {new / old:>8.1f}x")
+    old = sum(sys.getsizeof(d) + sys.getsizeof(d.__dict__) for d in legacy[:1000]) / 1000
+    new = sum(sys.getsizeof(d) for d in slots[:1000]) / 1000
+    print(f"{'size':<12}{old:>12.0f} B {new:>12.0f} B")
+
+    print(f"\n{'':<12}{'loop':>14}{'array':>14}")
+    array = t7.DistanceArray.from_distances(slots)
+    loop, vectorized = best_rate(iadd_all, slots), best_rate(lambda a: a.sum(), array)
+    print(f"{'array sum':<12}{loop:>10,.0f}/s {vectorized:>10,.0f}/s {vectorized / loop:>8.1f}x")
+    elementwise = best_rate(lambda a: a + a, array)
+    print(f"{'array add':<12}{'':>14}{elementwise:>10,.0f}/s")
+
+if __name__ == '__main__':
+    main()
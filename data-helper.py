@@ -8,34 +8,34 @@ get_random_integer() -> int
     random integer between 1 and 1000
 get_random_double() -> float
     random float between 1 and 1000
+
+All functions accept an optional random stream rng (random_sampling.RandomStream)
+which is used instead of the global random module to get reproducible values.
 """
 import random
 import datetime
+from random_sampling import DateSampler
 
-def get_random_date():
-    """Generating random date between years 1900 and 2025 as string."""
-    year = random.randint(1900, 2025)
-    month = random.randint(1, 12)
-    if month in [4, 6, 9, 11]:
-        day = random.randint(1, 30)
-    elif month == 2:
-        if year % 4 == 0:
-            day = random.randint(1, 29)
-        else:
-            day = random.randint(1, 28)
-    else:
-        day = random.randint(1, 31)
+# Sampler of the random dates between years 1900 and 2025
+DATES = DateSampler(datetime.date(1900, 1, 1), datetime.date(2025, 12, 31))
 
-    return str(datetime.datetime(year, month, day))
+def get_random_date(rng=None):
+    """Generating random date between years 1900 and 2025 as string.
+    Every day of the range is equally likely.
+    """
+    return DATES.sample(rng) + ' 00:00:00'
 
-def get_random_string():
+def get_random_string(rng=None):
     """Generates a random string of 1 to 10 lowercase characters."""
-    return ''.join(random.choices('abcdefghijklmnopqrstuvwxyz', k = random.randint(1, 10)))
+    source = random if rng is None else rng.random
+    return ''.join(source.choices('abcdefghijklmnopqrstuvwxyz', k = source.randint(1, 10)))
 
-def get_random_integer():
+def get_random_integer(rng=None):
     """Generates a random integer between 1 and 1000."""
-    return random.randint(1, 1000)
+    source = random if rng is None else rng.random
+    return source.randint(1, 1000)
 
-def get_random_double():
+def get_random_double(rng=None):
     """Generates a random float between 1 and 1000."""
-    return random.uniform(1, 1000)
+    source = random if rng is None else rng.random
+    return source.uniform(1, 1000)
@@ -0,0 +1,150 @@
+"""The module contains the class RandomStream which is used as a random
+context by the random data helpers in t1_generators and data-helper and
+the class DateSampler which draws uniform random dates from a range.
+
+A stream is identified by a seed and a stream id. Two streams with the
+same seed and stream id produce the same values in every process, while
+streams with different ids are independent of each other. This way a job
+can be split between any number of workers, where every part of the job
+uses its own stream, and the result stays the same.
+"""
+import random
+import datetime
+import numpy as np
+
+# Ranges with more days use date arithmetic instead of a lookup table of strings
+MAX_TABLE_DAYS = 200_000
+
+class RandomStream:
+    """A class to represent a reproducible random stream.
+
+    The stream is built on numpy SeedSequence: the stream id is used as the
+    spawn key of the sequence, so the substreams of a stream are the same as
+    the children created by SeedSequence.spawn.
+
+    Attributes
+    ----------
+    seed : int
+        The entropy of the stream (drawn from the OS if no seed is given)
+    stream_id : tuple[int, ...]
+        The id of the stream, every substream appends its index to it
+    seed_sequence : np.random.SeedSequence
+        The seed sequence of the stream
+    generator : np.random.Generator
+        A numpy generator used for bulk draws
+    random : random.Random
+        A generator with the same methods as the random module used for
+        single draws
+
+    Methods
+    -------
+    substream(stream_id) -> RandomStream
+        Returns the substream with the given id
+    spawn(n) -> list[RandomStream]
+        Returns the first n substreams
+
+    Raises
+    ------
+    ValueError
+        If a stream id is not a non-negative integer
+    """
+    def __init__(self, seed=None, stream_id=()):
+        if isinstance(stream_id, int):
+            stream_id = (stream_id,)
+        if any(not isinstance(i, int) or i < 0 for i in stream_id):
+            raise ValueError("stream_id must be a non-negative integer")
+        self.seed_sequence = np.random.SeedSequence(seed, spawn_key=tuple(stream_id))
+        self.seed = self.seed_sequence.entropy
+        self.stream_id = self.seed_sequence.spawn_key
+        self.generator = np.random.default_rng(self.seed_sequence)
+        self.random = random.Random(self.seed_sequence.generate_state(8).tobytes())
+
+    def substream(self, stream_id: int) -> 'RandomStream':
+        """Returns the substream with the given id"""
+        return RandomStream(self.seed, self.stream_id + (stream_id,))
+
+    def spawn(self, n: int) -> list['RandomStream']:
+        """Returns the first n substreams"""
+        return [self.substream(i) for i in range(n)]
+
+    def __repr__(self):
+        return f"RandomStream(seed={self.seed}, stream_id={self.stream_id})"
+
+class DateSampler:
+    """A class to draw uniform random dates between two dates (both included).
+
+    A date is drawn as a single integer day offset from the start date. The
+    offset is converted to a 'YYYY-MM-DD' string with a precomputed lookup
+    table (for ranges up to MAX_TABLE_DAYS days) or with date arithmetic, and
+    to numpy datetime64 values in bulk.
+
+    Attributes
+    ----------
+    start : datetime.date
+        The first date of the range
+    end : datetime.date
+        The last date of the range
+    num_days : int
+        The number of days in the range
+
+    Methods
+    -------
+    sample(rng=None) -> str
+        Returns a random date as string in format 'YYYY-MM-DD'
+    sample_many(size, rng=None) -> np.ndarray
+        Returns an array of size random dates as numpy datetime64[D]
+    sample_strings(size, rng=None) -> list[str]
+        Returns a list of size random dates in format 'YYYY-MM-DD'
+
+    Raises
+    ------
+    ValueError
+        If start or end is not a date or start is after end
+    """
+    def __init__(self, start: datetime.date, end: datetime.date):
+        if not isinstance(start, datetime.date) or not isinstance(end, datetime.date):
+            raise ValueError("start and end must be dates")
+        if start > end:
+            raise ValueError("start must not be after end")
+        self.start = start
+        self.end = end
+        self.num_days = (end - start).days + 1
+        self._first_day = np.datetime64(start, 'D')
+        self._table: list[str] | None = None
+        self._table_array: np.ndarray | None = None
+        if self.num_days <= MAX_TABLE_DAYS:
+            self._table = [(start + datetime.timedelta(days=i)).isoformat()
+                           for i in range(self.num_days)]
+
+    def _offsets(self, size, rng):
+        generator = np.random.default_rng() if rng is None else rng.generator
+        return generator.integers(0, self.num_days, size=size)
+
+    def sample(self, rng=None) -> str:
+        """Returns a random date as string in format 'YYYY-MM-DD'. Optionally
+        a RandomStream rng can be used instead of the global random module.
+        """
+        source = random if rng is None else rng.random
+        offset = source.randrange(self.num_days)
+        if self._table is not None:
+            return self._table[offset]
+        return datetime.date.fromordinal(self.start.toordinal() + offset).isoformat()
+
+    def sample_many(self, size: int, rng=None) -> np.ndarray:
+        """Returns an array of size random dates as numpy datetime64[D].
+        Optionally the numpy generator of a RandomStream rng is used.
+        """
+        return self._first_day + self._offsets(size, rng)
+
+    def sample_strings(self, size: int, rng=None) -> list[str]:
+        """Returns a list of size random dates in format 'YYYY-MM-DD'.
+        Optionally the numpy generator of a RandomStream rng is used.
+        """
+        if self._table is None:
+            return self.sample_many(size, rng).astype(str).tolist()
+        if self._table_array is None:
+            self._table_array = np.array(self._table)
+        return self._table_array[self._offsets(size, rng)].tolist()
+
+    def __repr__(self):
+        return f"DateSampler(start={self.start!r}, end={self.end!r})"
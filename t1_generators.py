@@ -7,15 +7,25 @@ Yields:
     str: A row of random data.
 """
 
+import os
 import random
+import shutil
 import datetime
+from concurrent.futures import ProcessPoolExecutor
 from typing import Generator
+import numpy as np
+from random_sampling import RandomStream, DateSampler
 
-def random_word(n=8) -> str:
+# Sampler of the random dates between years 1900 and 2025
+DATES = DateSampler(datetime.date(1900, 1, 1), datetime.date(2025, 12, 31))
+
+def random_word(n=8, rng=None) -> str:
     """Takes a positive integer n and returns a random word with n characters.
 
     Args:
         n (int, optional): The length of the random word created. Defaults to 8.
+        rng (RandomStream, optional): The random stream to be used.
+            Defaults to the global random module.
 
     Raises:
         ValueError: If the input is not integer or is not positive.
@@ -26,49 +36,101 @@ def random_word(n=8) -> str:
 
     if not isinstance(n, int) or n <= 0:
         raise ValueError("n must be a positive integer")
-    return ''.join(random.choices('abcdefghijklmnopqrstuvwxyz', k=n))
+    source = random if rng is None else rng.random
+    return ''.join(source.choices('abcdefghijklmnopqrstuvwxyz', k=n))
 
-def random_date() -> str:
+def random_date(rng=None) -> str:
     """Returns a random date between years 1900 and 2025 as 
-    string in format 'YYYY-MM-DD'.
+    string in format 'YYYY-MM-DD'. Every day of the range is
+    equally likely.
+
+    Args:
+        rng (RandomStream, optional): The random stream to be used.
+            Defaults to the global random module.
 
     Returns:
         str: Random date between 1900 and 2025.
     """
 
-    year = random.randint(1900, 2025)
-    month = random.randint(1, 12)
-
-    # Check witch month and year are randomly choosen and
-    # choose and random day
-    if month in [4, 6, 9, 11]:
-        day = random.randint(1, 30)
-    elif month == 2:
-        if year % 4 == 0:
-            day = random.randint(1, 29)
-        else:
-            day = random.randint(1, 28)
-    else:
-        day = random.randint(1, 31)
-
-    # Create a datetime object from the random variables and
-    # remove the suffix seconds
-    return str(datetime.datetime(year, month, day)).removesuffix(' 00:00:00')
-
-def random_bool() -> str:
-    """Returns a random boolean as string."""
-    return str(random.choice([True, False]))
-
-def generate_random_data(num_rows: int, word_length=8) -> Generator[str, None, None]:
+    return DATES.sample(rng)
+
+def random_bool(rng=None) -> str:
+    """Returns a random boolean as string. Optionally a RandomStream rng
+    can be used instead of the global random module.
+    """
+    source = random if rng is None else rng.random
+    return str(source.choice([True, False]))
+
+def generate_random_chunks(num_rows: int, word_length=8, chunk_size=10_000,
+                           rng=None) -> Generator[list[str], None, None]:
+    """Takes a positive integer num_rows and yields that many rows of random data
+    in chunks (lists) of at most chunk_size rows.
+
+    Every chunk is generated column by column with the numpy generator of
+    its own substream of rng (the k-th chunk uses rng.substream(k)): the words
+    are drawn as blocks of character codes, the dates as day offsets from
+    1900-01-01 and the booleans as one array. So for a fixed seed the rows
+    depend only on the chunk_size. The rows have the same format as the rows
+    of generate_random_data.
+
+    Args:
+        num_rows (int): The number of rows with random data to be yielded.
+        word_length (int, optional): The number of characters in the random word. Defaults to 8.
+        chunk_size (int, optional): The maximal number of rows in a chunk. Defaults to 10_000.
+        rng (RandomStream, optional): The random stream to be used.
+            Defaults to a new unseeded stream.
+
+    Raises:
+        ValueError: If num_rows, word_length or chunk_size is not integer or is not positive.
+
+    Yields:
+        Generator[list[str], None, None]: A list of rows of random data.
+    """
+
+    if not isinstance(num_rows, int) or num_rows <= 0:
+        raise ValueError("num_rows must be a positive integer")
+    if not isinstance(word_length, int) or word_length <= 0:
+        raise ValueError("word_length must be a positive integer")
+    if not isinstance(chunk_size, int) or chunk_size <= 0:
+        raise ValueError("chunk_size must be a positive integer")
+    if rng is None:
+        rng = RandomStream()
+    return _random_chunks(rng, 0, _num_chunks(num_rows, chunk_size),
+                          num_rows, word_length, chunk_size)
+
+def _num_chunks(num_rows, chunk_size):
+    return -(-num_rows // chunk_size)
+
+def _random_chunks(stream, first_chunk, last_chunk, num_rows, word_length, chunk_size):
+    # yields the formatted rows of the chunks from first_chunk to last_chunk (exclusive)
+    for k in range(first_chunk, last_chunk):
+        chunk_stream = stream.substream(k)
+        rng = chunk_stream.generator
+        first = 1 + k * chunk_size
+        last = min(first + chunk_size, num_rows + 1)
+        size = last - first
+
+        # Every row of character codes is viewed as one bytes string
+        codes = rng.integers(ord('a'), ord('z') + 1, size=(size, word_length), dtype=np.uint8)
+        words = codes.view(f'S{word_length}').ravel().astype(f'U{word_length}').tolist()
+        dates = DATES.sample_strings(size, chunk_stream)
+        bools = np.where(rng.integers(0, 2, size=size, dtype=np.bool_), 'True', 'False').tolist()
+
+        yield [f'"{i}", "{word}", "{date}", "{boolean}"'
+               for i, word, date, boolean in zip(range(first, last), words, dates, bools)]
+
+def generate_random_data(num_rows: int, word_length=8, rng=None) -> Generator[str, None, None]:
     """Takes a positive integer num_rows and yields that many rows of random data.
 
     The format is '"num_of_row", "random_word", "random_date", "random_bool"'.
     Optionally also the length of the random word can be choosen with the
-    parameter word_length.
+    parameter word_length. The rows are taken from generate_random_chunks.
 
     Args:
         num_rows (int): The number of rows with random data to be yielded.
         word_length (int, optional): The number of characters in the random word. Defaults to 8.
+        rng (RandomStream, optional): The random stream to be used.
+            Defaults to a new unseeded stream.
 
     Raises:
         ValueError: If the input is not integer or is not positive.
@@ -79,21 +141,77 @@ def generate_random_data(num_rows: int, word_length=8) -> Generator[str, None, N
 
     if not isinstance(num_rows, int) or num_rows <= 0:
         raise ValueError("num_rows must be a positive integer")
-    return (f'"{i}", "{random_word(word_length)}", "{random_date()}", "{random_bool()}"'
-            for i in range(1, num_rows+1))
+    return (row for chunk in generate_random_chunks(num_rows, word_length, rng=rng)
+            for row in chunk)
 
-def write_into_csv(filename, num_rows: int, word_length=8) -> None:
+def write_into_csv(filename, num_rows: int, word_length=8, chunk_size=10_000,
+                   buffer_size=1 << 20, workers=1, seed=None) -> None:
     """Takes a file and writes n rows of random data in it.
 
+    The rows are generated and written in chunks of chunk_size rows through a
+    file buffer of buffer_size bytes. With workers > 1 the chunks are split in
+    consecutive ranges which are generated by a process pool. Every worker
+    writes its range into a part file and the parts are concatenated in order
+    into the file. Every chunk has its own random stream (see
+    generate_random_chunks), so for a fixed seed the file is the same for any
+    number of workers.
+
     Args:
         filename (str): The name or path of the file.
         num_rows (int): The number of random rows to be written in the file.
         word_length (int, optional): The length of the random words. Defaults to 8.
+        chunk_size (int, optional): The number of rows written at once. Defaults to 10_000.
+        buffer_size (int, optional): The size of the file buffer in bytes. Defaults to 1 MiB.
+        workers (int, optional): The number of worker processes. Defaults to 1.
+        seed (int, optional): The seed of the random streams. Defaults to None.
+
+    Raises:
+        ValueError: If an integer input is not integer or is not positive.
     """
 
-    with open(filename, mode='w', encoding='utf-8') as file:
-        for line in generate_random_data(num_rows, word_length):
-            file.write(line + '\n')
+    if not isinstance(num_rows, int) or num_rows <= 0:
+        raise ValueError("num_rows must be a positive integer")
+    if not isinstance(word_length, int) or word_length <= 0:
+        raise ValueError("word_length must be a positive integer")
+    if not isinstance(chunk_size, int) or chunk_size <= 0:
+        raise ValueError("chunk_size must be a positive integer")
+    if not isinstance(buffer_size, int) or buffer_size <= 0:
+        raise ValueError("buffer_size must be a positive integer")
+    if not isinstance(workers, int) or workers <= 0:
+        raise ValueError("workers must be a positive integer")
+
+    stream = RandomStream(seed)
+    num_chunks = _num_chunks(num_rows, chunk_size)
+    workers = min(workers, num_chunks)
+    if workers == 1:
+        _write_rows(filename, stream, 0, num_chunks, num_rows, word_length, chunk_size, buffer_size)
+        return
+
+    # Consecutive chunk ranges [bounds[k], bounds[k+1]) for every worker
+    bounds = [num_chunks * k // workers for k in range(workers + 1)]
+    parts = [f'{filename}.part{k}' for k in range(workers)]
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(_write_rows, parts, [stream] * workers, bounds[:-1], bounds[1:],
+                          [num_rows] * workers, [word_length] * workers,
+                          [chunk_size] * workers, [buffer_size] * workers))
+        with open(filename, mode='wb') as file:
+            for part in parts:
+                with open(part, mode='rb') as part_file:
+                    shutil.copyfileobj(part_file, file, buffer_size)
+    finally:
+        for part in parts:
+            if os.path.exists(part):
+                os.remove(part)
+
+def _write_rows(filename, stream, first_chunk, last_chunk, num_rows, word_length,
+                chunk_size, buffer_size):
+    # writes the chunks from first_chunk to last_chunk (exclusive) into the file,
+    # one write call per chunk
+    with open(filename, mode='w', encoding='utf-8', buffering=buffer_size) as file:
+        for chunk in _random_chunks(stream, first_chunk, last_chunk, num_rows,
+                                    word_length, chunk_size):
+            file.write('\n'.join(chunk) + '\n')
 
 def main():
     """Test"""
@@ -7,7 +7,24 @@ lambda_4
 
 Each function returns another lambda function which takes a list
 and modifies it accordingly.
+
+For large lists the module also contains the function intersect
+which finds the common elements with a hash set, a sorted list or numpy,
+and the functions word_features, word_feature_columns and
+word_feature_batches which extract the features of lambda_1 and
+lambda_2 from a stream of words in a single pass and the function
+sort_by_last_char which sorts like lambda_4 in linear time.
 """
+from bisect import bisect_left
+from itertools import islice
+from typing import Generator, Iterable
+import numpy as np
+
+# The vectorized string functions (numpy.char before numpy 2.0)
+_strings = getattr(np, 'strings', np.char)
+
+# Separator of the words joined in one string, it is not changed by upper/lower
+_SEPARATOR = '\x00'
 
 # 1: Given a sentence the lambda function accepts a list with the words
 # of the sentence and returns multiple lists containing the word,
@@ -46,14 +63,122 @@ def lambda_2():
     """
     return lambda sen: list(map(lambda word: list(map(lambda f: f(word), func_list)), sen))
 
+def word_features(words: Iterable[str]) -> Generator[tuple[str, str, str, int], None, None]:
+    """Takes an iterable (for example a generator) of words and yields
+    a row (word, word uppercase, word lowercase, length of the word) for
+    every word, reading every word only once.
+    """
+    return ((word, word.upper(), word.lower(), len(word)) for word in words)
+
+def _convert_joined(words, convert):
+    # converts all words with one call on the joined words (numpy's unicode
+    # case conversion is slower than str's), the words containing the
+    # separator are converted one by one
+    converted = convert(_SEPARATOR.join(words)).split(_SEPARATOR)
+    if len(converted) != len(words):
+        converted = [convert(word) for word in words]
+    return converted
+
+def word_feature_columns(words: Iterable[str]) -> dict[str, np.ndarray]:
+    """Takes an iterable of words and returns the features of lambda_1 as
+    columns: numpy string arrays 'word', 'upper' and 'lower' and an integer
+    array 'length'.
+    """
+    if not isinstance(words, list):
+        words = list(words)
+    word = np.array(words, dtype=str)
+    return {'word': word,
+            'upper': np.array(_convert_joined(words, str.upper), dtype=str),
+            'lower': np.array(_convert_joined(words, str.lower), dtype=str),
+            'length': _strings.str_len(word)}
+
+def word_feature_batches(words: Iterable[str],
+                         batch_size=100_000) -> Generator[dict[str, np.ndarray], None, None]:
+    """Takes an iterable of words and yields the columns (see
+    word_feature_columns) of every batch_size words, so a stream of
+    words is processed with bounded memory.
+
+    Raises:
+        ValueError: If batch_size is not a positive integer.
+    """
+    if not isinstance(batch_size, int) or batch_size <= 0:
+        raise ValueError("batch_size must be a positive integer")
+    words = iter(words)
+    return (word_feature_columns(batch)
+            for batch in iter(lambda: list(islice(words, batch_size)), []))
+
 # 3: Given are two lists. The lambda function returns a list
 # with common values
 
+def _unique(elements):
+    # keeps the first occurrence of every (also unhashable) element
+    result = []
+    for element in elements:
+        if element not in result:
+            result.append(element)
+    return result
+
+def intersect(x, y, keep_duplicates=True, method='hash'):
+    """Returns the elements of x which are also in y in the order of x.
+
+    Instead of searching every element of x in the list y (O(len(x)*len(y)))
+    the elements of y are put in a lookup structure first:
+    'hash' - a set, O(len(x) + len(y)); if the elements are not hashable
+             it falls back to searching the list,
+    'sorted' - a sorted list searched with binary search,
+               O((len(x) + len(y)) * log(len(y))), for orderable elements,
+    'numpy' - numpy.isin for numeric arrays, the result is a numpy array.
+
+    Args:
+        x (Iterable): The elements to be filtered.
+        y (Iterable): The elements to be searched in.
+        keep_duplicates (bool, optional): If False only the first occurrence
+            of every common element is kept. Defaults to True.
+        method (str, optional): 'hash', 'sorted' or 'numpy'. Defaults to 'hash'.
+
+    Raises:
+        ValueError: If the method is not supported.
+
+    Returns:
+        list | np.ndarray: The common elements.
+    """
+    if method == 'numpy':
+        x = np.asarray(x)
+        result = x[np.isin(x, np.asarray(y))]
+        if not keep_duplicates:
+            _, indices = np.unique(result, return_index=True)
+            result = result[np.sort(indices)]
+        return result
+
+    if method == 'hash':
+        # Iterators are consumed only once, also if there is a fallback
+        x = x if isinstance(x, (list, tuple)) else list(x)
+        y = y if isinstance(y, (list, tuple)) else list(y)
+        try:
+            lookup = set(y)
+            result = [element for element in x if element in lookup]
+        except TypeError:
+            result = [element for element in x if element in y]
+    elif method == 'sorted':
+        lookup = sorted(y)
+        size = len(lookup)
+        result = [element for element in x
+                  if (i := bisect_left(lookup, element)) < size and lookup[i] == element]
+    else:
+        raise ValueError("method must be 'hash', 'sorted' or 'numpy'")
+
+    if keep_duplicates:
+        return result
+    try:
+        return list(dict.fromkeys(result))
+    except TypeError:
+        return _unique(result)
+
 def lambda_3():
     """Returns a lambda function, which accepts two lists
     and returns a list with the common elements
     """
-    return lambda x,y: [element for element in x if element in y]
+    return lambda x,y: intersect(x, y)
 
 # 4: Given is a string. The lambda function takes a list and
 # returns it sorted by the the last character of each element
@@ -62,8 +187,54 @@ def lambda_3():
 def lambda_4():
     """Returns a lambda function, which sorts a given list
     by the the last character of each word alphabetically
+    (empty words are first)
     """
-    return lambda sen: sorted(sen, key = lambda word: word[len(word)-1])
+    return lambda sen: sorted(sen, key = lambda word: word[-1:])
+
+def _sort_numpy_by_last_char(words):
+    words = np.asarray(words, dtype=str)
+    if words.size == 0:
+        return words
+    # Every word as a row of character codes, padded with 0 (so empty words are first)
+    codes = np.ascontiguousarray(words).view(np.uint32).reshape(len(words), -1)
+    last = codes[np.arange(len(words)), np.maximum(_strings.str_len(words) - 1, 0)]
+    return words[np.argsort(last, kind='stable')]
+
+def sort_by_last_char(words: Iterable[str], method='bucket'):
+    """Returns the words sorted by their last character like lambda_4
+    (stable, empty words are first).
+
+    Args:
+        words (Iterable[str]): The words to be sorted.
+        method (str, optional): 'bucket' - the words are distributed in
+            buckets by their last character and the buckets are joined in
+            order, O(n) for a fixed alphabet; 'numpy' - a stable argsort of
+            the last character codes of a numpy string array, the result is
+            a numpy array. Defaults to 'bucket'.
+
+    Raises:
+        ValueError: If the method is not supported.
+
+    Returns:
+        list[str] | np.ndarray: The sorted words.
+    """
+    if method == 'numpy':
+        return _sort_numpy_by_last_char(words)
+    if method != 'bucket':
+        raise ValueError("method must be 'bucket' or 'numpy'")
+
+    buckets: dict[str, list[str]] = {}
+    for word in words:
+        key = word[-1:]
+        bucket = buckets.get(key)
+        if bucket is None:
+            buckets[key] = [word]
+        else:
+            bucket.append(word)
+    result = []
+    for key in sorted(buckets):
+        result.extend(buckets[key])
+    return result
 
 def main():
     """Test"""
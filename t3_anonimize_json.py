@@ -1,8 +1,58 @@
 """The file 'data.json' is given with information about users and their friends.
 This module loads the file, replace all names with None and save back the file
 as json
+
+The function anonimize traverses the data with an explicit stack (so any
+depth works), replaces the values of a set of sensitive keys according to a
+replacement policy and counts the replaced fields. For files which do not fit
+in memory anonimize_stream reads the json text in chunks, replaces the values
+while the tokens flow through and writes the output incrementally, and
+anonimize_parallel anonimizes the records of a top level array in batches
+with a process pool. The output can be written pretty printed, compact or
+as JSON Lines with the standard json module or with orjson (when installed).
+
+Instead of destroying the names, a Pseudonymizer can be used as policy: it
+replaces every distinct name with a stable keyed-hash token, so the same
+person can still be joined across records.
 """
+import os
+import re
+import hmac
 import json
+import hashlib
+import functools
+from itertools import islice
+from collections import Counter, deque
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# The replacement of the sensitive values with the policy 'token'
+REDACTED = '[REDACTED]'
+
+# Types of json values which are not traversed
+_SCALARS = frozenset({str, int, float, bool, type(None)})
+
+# The opening, separator and closing of the records of an array in every
+# output style
+_ARRAY_LAYOUTS = {
+    'pretty': ('[\n', ',\n', '\n]'),
+    'compact': ('[', ',', ']'),
+    'jsonl': ('', '\n', '\n'),
+}
+
+# Tokens of a json text: whitespace, strings, punctuation and other literals
+# (numbers, true, false, null)
+_TOKEN = re.compile(r'''
+      (?P<space>\s+)
+    | (?P<string>"[^"\\]*(?:\\.[^"\\]*)*")
+    | (?P<punct>[{}\[\]:,])
+    | (?P<literal>[^\s{}\[\]:,"]+)
+''', re.VERBOSE | re.DOTALL)
 
 def anonimize_name(x):
     """Anonimize an input list or dict where 'names' are converted to None.
@@ -10,16 +60,464 @@ def anonimize_name(x):
     Args:
         x (dict | list): The input dictionary or list to be anonimized.
     """
-    if isinstance(x, dict):
-        if 'name' in x:
-            x['name'] = None
-        for key in x:
-            anonimize_name(x[key])
-    elif isinstance(x, list):
-        for item in x:
-            anonimize_name(item)
-
-def main():
+    anonimize(x)
+
+def _hash_value(value):
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode('utf-8')).hexdigest()
+
+def _replacement(policy):
+    # returns a function which maps a sensitive value to its replacement
+    if policy is None:
+        return lambda value: None
+    if policy == 'hash':
+        return _hash_value
+    if policy == 'token':
+        return lambda value: REDACTED
+    if callable(policy):
+        return policy
+    raise ValueError("policy must be None, 'hash', 'token' or a callable")
+
+class Pseudonymizer:
+    """A class to represent a pseudonymization policy for anonimize.
+
+    Every value is replaced with a token made of the hex HMAC-SHA256 of its
+    json under a secret key, so equal values get equal tokens and the tokens
+    are stable between runs with the same key. The tokens of hashable values
+    are memoized in a size-bounded LRU cache, because the same names repeat
+    many times. None stays None.
+
+    Attributes
+    ----------
+    key : bytes
+        The secret key of the HMAC
+    length : int, optional
+        The number of hex characters of a token (default 16)
+    maxsize : int | None, optional
+        The maximal number of memoized tokens, None for no limit (default 65536)
+
+    Methods
+    -------
+    __call__(value) -> str | None
+        Returns the token of the value
+    cache_info() -> functools._CacheInfo
+        Returns the hits, misses and size of the cache
+
+    Raises
+    ------
+    ValueError
+        If the key is empty, the length is not an integer between 1 and 64
+        or maxsize is not a non-negative integer or None
+    """
+    def __init__(self, key, length=16, maxsize=65536):
+        if isinstance(key, str):
+            key = key.encode('utf-8')
+        if not isinstance(key, bytes) or not key:
+            raise ValueError("key must be a non-empty string or bytes")
+        if not isinstance(length, int) or not 1 <= length <= 64:
+            raise ValueError("length must be an integer between 1 and 64")
+        if maxsize is not None and (not isinstance(maxsize, int) or maxsize < 0):
+            raise ValueError("maxsize must be a non-negative integer or None")
+        self.key = key
+        self.length = length
+        self.maxsize = maxsize
+        self._build_cache()
+
+    def _build_cache(self):
+        # typed, so that for example 1 and True get different tokens
+        self._cached_token = functools.lru_cache(maxsize=self.maxsize, typed=True)(self._token)
+
+    def _token(self, value):
+        message = json.dumps(value, sort_keys=True).encode('utf-8')
+        return hmac.new(self.key, message, hashlib.sha256).hexdigest()[:self.length]
+
+    def __call__(self, value):
+        if value is None:
+            return None
+        if isinstance(value, (dict, list)):
+            return self._token(value)
+        return self._cached_token(value)
+
+    def cache_info(self):
+        """Returns the hits, misses and size of the cache"""
+        return self._cached_token.cache_info()
+
+    # The cache is not pickled, every process builds its own
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_cached_token']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._build_cache()
+
+    def __repr__(self):
+        return f"Pseudonymizer(length={self.length}, maxsize={self.maxsize})"
+
+def anonimize(x, keys=('name',), policy=None) -> Counter:
+    """Anonimize an input list or dict where the values of the sensitive keys
+    are replaced according to the policy.
+
+    The data is traversed with an explicit stack instead of recursion, so
+    the depth of the data is not limited by the recursion limit. The values
+    of the sensitive keys are replaced as a whole and not traversed.
+
+    Args:
+        x (dict | list): The input dictionary or list to be anonimized.
+        keys (Iterable[str], optional): The sensitive keys. Defaults to ('name',).
+        policy (None | str | Callable, optional): The replacement of the values:
+            None - the values are replaced with None,
+            'hash' - the values are replaced with the sha256 hash of their json,
+            'token' - the values are replaced with REDACTED,
+            a callable - the values are replaced with its result for the value.
+            Defaults to None.
+
+    Raises:
+        ValueError: If the policy is not supported.
+
+    Returns:
+        Counter: The number of replaced values for every key.
+    """
+    keys = frozenset(keys)
+    replace = _replacement(policy)
+    counts = Counter()
+    stack = [x]
+    push = stack.append
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            for key, value in item.items():
+                if key in keys:
+                    item[key] = replace(value)
+                    counts[key] += 1
+                else:
+                    # Cheap type checks first, isinstance only for unusual types
+                    kind = type(value)
+                    if kind is dict or kind is list or (
+                            kind not in _SCALARS and isinstance(value, (dict, list))):
+                        push(value)
+        elif isinstance(item, list):
+            for value in item:
+                kind = type(value)
+                if kind is dict or kind is list or (
+                        kind not in _SCALARS and isinstance(value, (dict, list))):
+                    push(value)
+    return counts
+
+@contextmanager
+def _open_file(file, mode):
+    # yields file objects as they are and opens paths
+    if hasattr(file, 'read' if mode == 'r' else 'write'):
+        yield file
+    else:
+        with open(file, mode=mode, encoding='utf-8') as opened:
+            yield opened
+
+def _iter_tokens(file, chunk_size):
+    # yields the (kind, text) tokens of a json text read from the file in chunks
+    buffer = ''
+    pos = 0
+    eof = False
+    while True:
+        match = _TOKEN.match(buffer, pos)
+        # A token reaching the end of the buffer may continue in the next chunk
+        if not eof and (match is None or
+                        (match.end() == len(buffer) and match.lastgroup != 'punct')):
+            chunk = file.read(chunk_size)
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            eof = not chunk
+            continue
+        if match is None:
+            if pos == len(buffer):
+                return
+            raise ValueError(f"invalid json text near {buffer[pos:pos + 20]!r}")
+        pos = match.end()
+        yield match.lastgroup, match.group()
+
+def _read_value(tokens, first):
+    # consumes the rest of a value starting with the token first and
+    # returns its json text
+    parts = [first]
+    depth = 1 if first in ('{', '[') else 0
+    while depth:
+        _, text = next(tokens, (None, None))
+        if text is None:
+            raise ValueError("unexpected end of json text")
+        if text in ('{', '['):
+            depth += 1
+        elif text in ('}', ']'):
+            depth -= 1
+        parts.append(text)
+    return ''.join(parts)
+
+def anonimize_stream(src, dst, chunk_size=1 << 16, keys=('name',), policy=None) -> Counter:
+    """Anonimize a json text where the values of the sensitive keys are
+    replaced according to the policy without loading the whole document.
+
+    The source is read in chunks of chunk_size characters and tokenized
+    incrementally. Every value of a sensitive key at any depth is replaced
+    (see anonimize) and all other tokens (including the whitespace) are
+    written to the destination as they are, so the memory usage does not
+    depend on the size of the document.
+
+    Args:
+        src (str | PathLike | TextIO): The path or file object of the json text.
+        dst (str | PathLike | TextIO): The path or file object of the output.
+        chunk_size (int, optional): The number of characters read at once.
+            Defaults to 65536.
+        keys (Iterable[str], optional): The sensitive keys. Defaults to ('name',).
+        policy (None | str | Callable, optional): The replacement of the values.
+            Defaults to None.
+
+    Raises:
+        ValueError: If the source contains an invalid token or the policy is
+            not supported.
+
+    Returns:
+        Counter: The number of replaced values for every key.
+    """
+    keys = frozenset(keys)
+    encoded_keys = {json.dumps(key, ensure_ascii=False): key for key in keys}
+    replace = _replacement(policy)
+    counts = Counter()
+    with _open_file(src, 'r') as src_file, _open_file(dst, 'w') as dst_file:
+        tokens = _iter_tokens(src_file, chunk_size)
+        output = []
+        # containers is a stack of the open '{' and '[', expect_key is True if
+        # the next string is a key and key is the sensitive key whose value
+        # follows (None for other keys)
+        containers = []
+        expect_key = False
+        key = None
+        redact = False
+        for kind, text in tokens:
+            if kind == 'space':
+                pass
+            elif redact:
+                redact = False
+                value = _read_value(tokens, text)
+                text = 'null' if policy is None else json.dumps(replace(json.loads(value)))
+                counts[key] += 1
+                key = None
+            elif text in ('{', '['):
+                containers.append(text)
+                expect_key = text == '{'
+            elif text in ('}', ']'):
+                containers.pop()
+                expect_key = False
+            elif text == ',':
+                expect_key = bool(containers) and containers[-1] == '{'
+            elif text == ':':
+                redact = key is not None
+            elif expect_key:
+                expect_key = False
+                key = encoded_keys.get(text)
+                if key is None and '\\' in text and json.loads(text) in keys:
+                    key = json.loads(text)
+
+            output.append(text)
+            if len(output) >= 4096:
+                dst_file.write(''.join(output))
+                output.clear()
+        dst_file.write(''.join(output))
+    return counts
+
+def _iter_records(tokens):
+    # yields the json texts of the elements of a top level array
+    for kind, text in tokens:
+        if kind != 'space':
+            break
+    else:
+        text = None
+    if text != '[':
+        raise ValueError("the json text must be a top level array")
+    for kind, text in tokens:
+        if kind == 'space' or text == ',':
+            continue
+        if text == ']':
+            return
+        yield _read_value(tokens, text)
+    raise ValueError("unexpected end of json text")
+
+def _encoder(style, backend):
+    # returns a function which encodes a json value with the style and backend
+    if style not in _ARRAY_LAYOUTS:
+        raise ValueError("style must be 'pretty', 'compact' or 'jsonl'")
+    if backend not in ('auto', 'json', 'orjson'):
+        raise ValueError("backend must be 'auto', 'json' or 'orjson'")
+    if backend == 'orjson' and orjson is None:
+        raise ValueError("orjson is not installed")
+    # orjson does not support an indent of 4 spaces
+    if style == 'pretty':
+        return lambda data: json.dumps(data, indent=4)
+    if backend != 'json' and orjson is not None:
+        return functools.partial(_orjson_dumps, fallback=backend == 'auto')
+    return _compact_dumps
+
+def _compact_dumps(data):
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+def _has_non_finite(data):
+    # if there is a NaN or an infinite float in the json value
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        kind = type(value)
+        if kind is dict:
+            stack.extend(value.values())
+        elif kind is list:
+            stack.extend(value)
+        elif kind is float and value - value != 0:
+            return True
+    return False
+
+def _orjson_dumps(data, fallback):
+    # orjson writes NaN and Infinity as null and cannot encode integers with
+    # more than 64 bits or keys which are not strings; 'auto' encodes such
+    # values with the json module like the other styles, 'orjson' rejects them
+    if _has_non_finite(data):
+        if fallback:
+            return _compact_dumps(data)
+        raise ValueError("orjson cannot encode NaN and Infinity")
+    try:
+        return orjson.dumps(data).decode('utf-8')
+    except orjson.JSONEncodeError:
+        if fallback:
+            return _compact_dumps(data)
+        raise
+
+def dump_json(data, file, style='pretty', backend='auto') -> None:
+    """Saves the data as json.
+
+    Args:
+        data: The data to be saved.
+        file (str | PathLike | TextIO): The path or file object of the output.
+        style (str, optional): The output style:
+            'pretty' - indented with 4 spaces (always with the json module),
+            'compact' - without whitespace,
+            'jsonl' - JSON Lines, every element of a top level array (or the
+            data if it is not a list) compact on its own line.
+            Defaults to 'pretty'.
+        backend (str, optional): The encoder: 'json', 'orjson' or 'auto'
+            (orjson if it is installed, otherwise json; values which orjson
+            cannot encode exactly, like NaN, Infinity, integers with more
+            than 64 bits and keys which are not strings, are encoded with
+            json). Defaults to 'auto'.
+
+    Raises:
+        ValueError: If the style or backend is not supported, orjson is
+            requested but not installed or the orjson backend gets NaN or
+            Infinity.
+        TypeError: If the orjson backend gets a value it cannot encode.
+    """
+    encode = _encoder(style, backend)
+    with _open_file(file, 'w') as output:
+        if style == 'pretty':
+            json.dump(data, output, indent=4)
+        elif style == 'compact':
+            output.write(encode(data))
+        else:
+            items = data if isinstance(data, list) else [data]
+            for start in range(0, len(items), 1000):
+                output.write(''.join(encode(item) + '\n' for item in items[start:start + 1000]))
+
+# The keys, policy, style and backend of anonimize_parallel in a worker process
+_worker_options = None
+
+def _init_worker(*options):
+    # the options are sent once per worker, so a policy keeps its state
+    # (like the cache of a Pseudonymizer) between the batches
+    global _worker_options
+    _worker_options = options
+
+def _anonimize_batch(records):
+    # anonimizes a batch of json texts and returns the new texts and the counts
+    keys, policy, style, backend = _worker_options
+    encode = _encoder(style, backend)
+    counts = Counter()
+    texts = []
+    for record in records:
+        data = json.loads(record)
+        counts.update(anonimize([data], keys, policy))
+        texts.append(encode(data))
+    if style == 'pretty':
+        # The records are nested one level in the array
+        texts = ['    ' + text.replace('\n', '\n    ') for text in texts]
+    return texts, counts
+
+def anonimize_parallel(src, dst, workers=None, batch_size=1000, keys=('name',),
+                       policy=None, chunk_size=1 << 16, style='compact',
+                       backend='auto') -> Counter:
+    """Anonimize a json text with a top level array (like data.json) with a
+    process pool.
+
+    The array is split into batches of batch_size records while the source
+    is read in chunks (see anonimize_stream). The batches are anonimized
+    (see anonimize) by workers processes and the results are written in the
+    original order in the given style (see dump_json). At most two batches
+    per worker are in progress at once, so the memory usage is bounded.
+
+    Args:
+        src (str | PathLike | TextIO): The path or file object of the json text.
+        dst (str | PathLike | TextIO): The path or file object of the output.
+        workers (int, optional): The number of processes. Defaults to the number of CPUs.
+        batch_size (int, optional): The number of records in a batch. Defaults to 1000.
+        keys (Iterable[str], optional): The sensitive keys. Defaults to ('name',).
+        policy (None | str | Callable, optional): The replacement of the values,
+            a callable must be picklable. Defaults to None.
+        chunk_size (int, optional): The number of characters read at once.
+            Defaults to 65536.
+        style (str, optional): The output style. Defaults to 'compact'.
+        backend (str, optional): The encoder. Defaults to 'auto'.
+
+    Raises:
+        ValueError: If workers or batch_size is not a positive integer, the
+            policy, style or backend is not supported or the json text is not
+            a top level array.
+
+    Returns:
+        Counter: The number of replaced values for every key.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if not isinstance(workers, int) or workers <= 0:
+        raise ValueError("workers must be a positive integer")
+    if not isinstance(batch_size, int) or batch_size <= 0:
+        raise ValueError("batch_size must be a positive integer")
+    _replacement(policy)
+    _encoder(style, backend)
+    keys = frozenset(keys)
+    opening, separator, closing = _ARRAY_LAYOUTS[style]
+
+    counts = Counter()
+    with _open_file(src, 'r') as src_file, _open_file(dst, 'w') as dst_file, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                initargs=(keys, policy, style, backend)) as pool:
+        records = _iter_records(_iter_tokens(src_file, chunk_size))
+        pending = deque()
+        written = False
+
+        def write_next():
+            nonlocal written
+            texts, batch_counts = pending.popleft().result()
+            dst_file.write((separator if written else opening) + separator.join(texts))
+            written = True
+            counts.update(batch_counts)
+
+        while batch := list(islice(records, batch_size)):
+            pending.append(pool.submit(_anonimize_batch, batch))
+            if len(pending) >= 2 * workers:
+                write_next()
+        while pending:
+            write_next()
+        if written:
+            dst_file.write(closing)
+        elif style != 'jsonl':
+            dst_file.write('[]')
+    return counts
+
+def main(style='pretty', backend='auto'):
     """The main function of the module"""
     # Step 1: Open and load the file 'data.json'
     with open('data.json', mode='r', encoding='utf-8') as file:
@@ -29,8 +527,7 @@ def main():
     anonimize_name(data)
 
     # Step 3: Save the data as another json file
-    with open('anonimized_data.json', mode='w', encoding='utf-8') as file:
-        json.dump(data, file, indent=4)
+    dump_json(data, 'anonimized_data.json', style, backend)
 
 if __name__ == "__main__":
     main()
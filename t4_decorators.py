@@ -11,29 +11,438 @@ executed from bottom to top. So, first the 'split_string'
 is called to cerate a list from the string, than the 'up'
 to make elements uppercase and finaly 'fil' to filter out
 the short words.
+
+Every one of these decorators creates a whole new list. The
+pipeline stages split_stage, up_stage and fil_stage do the
+same, but stacked stages are fused into one Pipeline which
+goes through the elements only once (see Pipeline).
+
+The instrumentation decorators timed, counted, track_memory,
+profiled and the configurable instrument measure the calls of
+any function (also the decorated ones) and collect the results
+in a StatsRegistry. When the environment variable
+T4_INSTRUMENTATION is '0', 'off', 'false' or 'no' they return
+the functions unchanged, so they have no overhead.
+
+The decorator cache memoizes the results of a function with a
+bounded LRU size and an optional time to live.
 """
+import io
+import os
+import time
+import pstats
+import cProfile
+import functools
+import threading
+import tracemalloc
+from collections import OrderedDict, namedtuple
 
 def split_string(func):
     """A decorator that splits the result string of the
     function being called into a list.
     """
-    def wrapper():
-        return func().split()
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return func(*args, **kwargs).split()
     return wrapper
 
 def up(func):
     """A decorator that takes every element from a result
     list and makes it uppercase.
     """
-    def wrapper():
-        return [i.upper() for i in func()]
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return [i.upper() for i in func(*args, **kwargs)]
     return wrapper
 def fil(func):
     """A decorator that filters all elements from a
     result list with length less than 4 out.
     """
-    def wrapper():
-        return [i for i in func() if len(i) > 3]
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return [i for i in func(*args, **kwargs) if len(i) > 3]
+    return wrapper
+
+class Pipeline:
+    """A class to represent a function followed by fused stages.
+
+    A Pipeline is created by a stage decorator (see stage). When another
+    stage decorates a Pipeline, the stage is appended to it instead of
+    wrapping it. On a call the steps are chained as built-in map and filter
+    iterators, so every element goes through all stages in a single pass
+    without intermediate lists.
+
+    Attributes
+    ----------
+    func : Callable
+        The decorated function, it can have any arguments
+    source : Callable | None
+        A function which converts the result of func into an iterable
+        (for example str.split), None to iterate the result directly
+    steps : list[tuple[str, Callable]]
+        The fused ('map', function) and ('filter', predicate) steps
+    lazy : bool
+        If True a call returns an iterator, otherwise a list
+
+    Methods
+    -------
+    __call__(*args, **kwargs) -> list | Iterator
+        Calls func and runs the result through the stages
+    """
+    def __init__(self, func, source=None, steps=(), lazy=False):
+        functools.update_wrapper(self, func)
+        self.func = func
+        self.source = source
+        self.steps = list(steps)
+        self.lazy = lazy
+
+    def __call__(self, *args, **kwargs):
+        items = self.func(*args, **kwargs)
+        if self.source is not None:
+            items = self.source(items)
+        items = iter(items)
+        for kind, step in self.steps:
+            items = map(step, items) if kind == 'map' else filter(step, items)
+        return items if self.lazy else list(items)
+
+def stage(kind, step):
+    """Returns a pipeline stage decorator.
+
+    Args:
+        kind (str): 'source' - step converts the result of the function
+            into an iterable of elements (it must be the first stage),
+            'map' - step converts every element,
+            'filter' - step is a predicate which keeps the elements.
+        step (Callable): The function of the stage.
+
+    Raises:
+        ValueError: If the kind is not supported or a source stage
+            decorates another stage.
+
+    Returns:
+        Callable: A decorator which fuses the stage with the decorated
+            Pipeline or creates a new Pipeline from the function.
+    """
+    if kind not in ('source', 'map', 'filter'):
+        raise ValueError("kind must be 'source', 'map' or 'filter'")
+
+    def decorator(func):
+        if kind == 'source':
+            if isinstance(func, Pipeline):
+                raise ValueError("a source stage must be the first stage")
+            return Pipeline(func, source=step)
+        if isinstance(func, Pipeline):
+            return Pipeline(func.func, func.source, func.steps + [(kind, step)], func.lazy)
+        return Pipeline(func, steps=[(kind, step)])
+    return decorator
+
+def lazy(func):
+    """A decorator that makes a Pipeline return an iterator
+    instead of a list.
+    """
+    if not isinstance(func, Pipeline):
+        func = Pipeline(func)
+    return Pipeline(func.func, func.source, func.steps, lazy=True)
+
+# The stages of split_string, up and fil
+split_stage = stage('source', str.split)
+up_stage = stage('map', str.upper)
+fil_stage = stage('filter', lambda i: len(i) > 3)
+
+def instrumentation_enabled() -> bool:
+    """Returns False if the environment variable T4_INSTRUMENTATION
+    turns the instrumentation off.
+    """
+    return os.environ.get('T4_INSTRUMENTATION', '1').strip().lower() not in ('0', 'off',
+                                                                          'false', 'no')
+
+class CallStats:
+    """A class to represent the aggregated measurements of a function.
+
+    Attributes
+    ----------
+    calls : int
+        The number of calls
+    wall_time : float
+        The total wall clock time of the calls in seconds
+    cpu_time : float
+        The total CPU time of the process during the calls in seconds
+    peak_memory : int
+        The largest memory allocated during one call in bytes (tracemalloc)
+    profile : cProfile.Profile | None
+        The accumulated profile of the calls
+
+    Methods
+    -------
+    profile_report(limit=20) -> str
+        Returns the profile sorted by cumulative time
+    """
+    __slots__ = ('calls', 'wall_time', 'cpu_time', 'peak_memory', 'profile')
+
+    def __init__(self):
+        self.calls = 0
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        self.peak_memory = 0
+        self.profile: cProfile.Profile | None = None
+
+    def profile_report(self, limit=20) -> str:
+        """Returns the profile sorted by cumulative time"""
+        # a nested profiled call is not profiled, so its profile can be empty
+        if self.profile is None or not self.profile.getstats():
+            return ''
+        stream = io.StringIO()
+        pstats.Stats(self.profile, stream=stream).sort_stats('cumulative').print_stats(limit)
+        return stream.getvalue()
+
+    def __repr__(self):
+        return (f"CallStats(calls={self.calls}, wall_time={self.wall_time:.6f}, "
+                f"cpu_time={self.cpu_time:.6f}, peak_memory={self.peak_memory})")
+
+class StatsRegistry:
+    """A class to collect the CallStats of the instrumented functions by name.
+
+    Methods
+    -------
+    get(name) -> CallStats
+        Returns the stats of the name (created if missing)
+    reset() -> None
+        Removes all stats
+    report() -> str
+        Returns a table of all stats
+    """
+    def __init__(self):
+        self._stats: dict[str, CallStats] = {}
+
+    def get(self, name: str) -> CallStats:
+        """Returns the stats of the name (created if missing)"""
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats[name] = CallStats()
+        return stats
+
+    def __getitem__(self, name: str) -> CallStats:
+        return self._stats[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._stats
+
+    def __iter__(self):
+        return iter(self._stats)
+
+    def __len__(self):
+        return len(self._stats)
+
+    def reset(self) -> None:
+        """Removes all stats"""
+        self._stats.clear()
+
+    def report(self) -> str:
+        """Returns a table of all stats"""
+        lines = [f"{'name':<30}{'calls':>8}{'wall [ms]':>12}{'cpu [ms]':>12}{'peak [B]':>12}"]
+        for name, stats in self._stats.items():
+            lines.append(f"{name:<30}{stats.calls:>8}{stats.wall_time * 1000:>12.3f}"
+                         f"{stats.cpu_time * 1000:>12.3f}{stats.peak_memory:>12}")
+        return '\n'.join(lines)
+
+# The default registry of the instrumentation decorators
+REGISTRY = StatsRegistry()
+
+def instrument(func=None, *, wall=True, cpu=True, memory=False, profile=False,
+               name=None, registry=None):
+    """A decorator that counts the calls of a function and optionally
+    measures their wall time, CPU time, peak memory (with tracemalloc)
+    and profile (with cProfile). It can be used with or without arguments.
+
+    The measurements are added to the CallStats of name (default the
+    qualified name of the function) in the registry (default REGISTRY).
+    Use different names to measure every level of stacked decorators.
+    Tracing memory and profiling are expensive and should be used only
+    for a few functions; nested profiled calls are not profiled again.
+
+    If the instrumentation is turned off (see instrumentation_enabled)
+    the function is returned unchanged.
+    """
+    if func is None:
+        return functools.partial(instrument, wall=wall, cpu=cpu, memory=memory,
+                                 profile=profile, name=name, registry=registry)
+    if not instrumentation_enabled():
+        return func
+    stats = (registry if registry is not None else REGISTRY).get(name or func.__qualname__)
+    if profile and stats.profile is None:
+        stats.profile = cProfile.Profile()
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        stats.calls += 1
+        if memory:
+            started_tracing = not tracemalloc.is_tracing()
+            if started_tracing:
+                tracemalloc.start()
+            start_memory, outer_peak = tracemalloc.get_traced_memory()
+            peaks = _memory_peaks()
+            if peaks:
+                # the peak of the outer traced call is lost by the reset
+                peaks[-1] = max(peaks[-1], outer_peak)
+            peaks.append(0)
+            tracemalloc.reset_peak()
+        profiling = False
+        if profile and not getattr(_local, 'profiling', False):
+            # Before Python 3.12 a nested enable takes over the profile hook
+            # and its disable stops the outer profile, so only the outermost
+            # profiled call of the thread is profiled
+            try:
+                stats.profile.enable()
+                profiling = _local.profiling = True
+            except ValueError:
+                # Another profiler is already active
+                pass
+        wall_start = time.perf_counter() if wall else 0.0
+        cpu_start = time.process_time() if cpu else 0.0
+        try:
+            return func(*args, **kwargs)
+        finally:
+            if cpu:
+                stats.cpu_time += time.process_time() - cpu_start
+            if wall:
+                stats.wall_time += time.perf_counter() - wall_start
+            if profiling:
+                stats.profile.disable()
+                _local.profiling = False
+            if memory:
+                # the peaks lost by the resets of the nested traced calls are
+                # saved on the stack
+                peak = max(tracemalloc.get_traced_memory()[1], peaks.pop())
+                stats.peak_memory = max(stats.peak_memory, peak - start_memory)
+                if peaks:
+                    peaks[-1] = max(peaks[-1], peak)
+                if started_tracing:
+                    tracemalloc.stop()
+    return wrapper
+
+# The memory peaks and the profiling flag of the current thread
+_local = threading.local()
+
+def _memory_peaks() -> list[int]:
+    # the stack of the peaks of the traced calls of the current thread
+    if not hasattr(_local, 'memory_peaks'):
+        _local.memory_peaks = []
+    return _local.memory_peaks
+
+def timed(func=None, *, name=None, registry=None):
+    """A decorator that counts the calls and measures the wall and CPU time."""
+    return instrument(func, name=name, registry=registry)
+
+def counted(func=None, *, name=None, registry=None):
+    """A decorator that only counts the calls."""
+    return instrument(func, wall=False, cpu=False, name=name, registry=registry)
+
+def track_memory(func=None, *, name=None, registry=None):
+    """A decorator that counts the calls and measures the peak memory."""
+    return instrument(func, wall=False, cpu=False, memory=True, name=name, registry=registry)
+
+def profiled(func=None, *, name=None, registry=None):
+    """A decorator that counts the calls, measures the time and profiles them."""
+    return instrument(func, profile=True, name=name, registry=registry)
+
+# The statistics of a function decorated with cache
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'skipped', 'expired', 'maxsize', 'currsize'])
+
+# Separates the positional and the keyword arguments in a cache key
+_KWARGS_MARK = object()
+
+def _make_key(*args, **kwargs):
+    # the default cache key, unhashable arguments make it unhashable
+    if kwargs:
+        return args + (_KWARGS_MARK,) + tuple(sorted(kwargs.items()))
+    return args
+
+def cache(func=None, *, maxsize=128, ttl=None, key=None):
+    """A decorator that memoizes the results of a function. It can be
+    used with or without arguments.
+
+    The least recently used result is evicted when there are more than
+    maxsize results and a result expires ttl seconds after it was
+    computed. The calls whose key is not hashable (for example a list
+    argument without a key function) are not cached but counted as
+    skipped. The cache is thread-safe; the function itself is called
+    outside the lock, so concurrent misses of the same key may call it
+    more than once. The cached result is returned as it is, so it should
+    not be modified. It composes with the other decorators of the module,
+    for example on top of fil, up and split_string.
+
+    The decorated function has the methods cache_info() -> CacheInfo and
+    cache_clear().
+
+    Args:
+        func (Callable, optional): The function to be decorated.
+        maxsize (int | None, optional): The maximal number of results,
+            None for no limit. Defaults to 128.
+        ttl (float | None, optional): The seconds a result is valid,
+            None for no expiry. Defaults to None.
+        key (Callable, optional): A function which takes the arguments of
+            the call and returns a hashable key. Defaults to the tuple of
+            the positional and keyword arguments.
+
+    Raises:
+        ValueError: If maxsize is not a non-negative integer or None or ttl
+            is not a positive number or None.
+    """
+    if maxsize is not None and (not isinstance(maxsize, int) or maxsize < 0):
+        raise ValueError("maxsize must be a non-negative integer or None")
+    if ttl is not None and (not isinstance(ttl, (int, float)) or ttl <= 0):
+        raise ValueError("ttl must be a positive number or None")
+    if func is None:
+        return functools.partial(cache, maxsize=maxsize, ttl=ttl, key=key)
+
+    make_key = key or _make_key
+    # key -> (expiry time or None, result), ordered from least to most recently used
+    results: OrderedDict = OrderedDict()
+    counts = {'hits': 0, 'misses': 0, 'skipped': 0, 'expired': 0}
+    lock = threading.RLock()
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            call_key = make_key(*args, **kwargs)
+            hash(call_key)
+        except TypeError:
+            with lock:
+                counts['skipped'] += 1
+            return func(*args, **kwargs)
+
+        with lock:
+            entry = results.get(call_key)
+            if entry is not None:
+                expiry, result = entry
+                if expiry is None or time.monotonic() < expiry:
+                    results.move_to_end(call_key)
+                    counts['hits'] += 1
+                    return result
+                del results[call_key]
+                counts['expired'] += 1
+            counts['misses'] += 1
+
+        result = func(*args, **kwargs)
+        with lock:
+            results[call_key] = (None if ttl is None else time.monotonic() + ttl, result)
+            results.move_to_end(call_key)
+            if maxsize is not None:
+                while len(results) > maxsize:
+                    results.popitem(last=False)
+        return result
+
+    def cache_info() -> CacheInfo:
+        with lock:
+            return CacheInfo(maxsize=maxsize, currsize=len(results), **counts)
+
+    def cache_clear() -> None:
+        with lock:
+            results.clear()
+            counts.update(dict.fromkeys(counts, 0))
+
+    wrapper.cache_info = cache_info
+    wrapper.cache_clear = cache_clear
     return wrapper
 
 def main():
@@ -49,5 +458,15 @@ def main():
 
     print(get_data())
 
+    # The same with fused stages and a function with arguments
+    @fil_stage
+    @up_stage
+    @split_stage
+    def get_text(text):
+        """Returns the given string"""
+        return text
+
+    print(get_text('This is An exAmPlE StRinG'))
+
 if __name__ == "__main__":
     main()
@@ -1,38 +1,236 @@
 """The module contains a Dice and Simulation classes in
 order to simulate rolling a dice and display the results
-using matplotlib bar chart.
+as text or as a matplotlib bar chart saved to a file.
+
+The simulation is run with numpy by default: the rolls of all
+dices are drawn as blocks of an array and the sums are counted
+with numpy.bincount, optionally split between worker processes.
+The original loop over the rolls is kept as the 'loop' engine.
+
+Instead of simulating, sum_distribution (and the method
+Simulation.exact_distribution) computes the exact probabilities
+of the sums by convolving the distributions of the dices.
+
+matplotlib is imported only when a chart is plotted. The chart is
+drawn on a standalone Figure with the Agg canvas, so plotting does
+not need a display and does not touch the global pyplot state.
 """
+import os
 import random
-import matplotlib.pyplot as plt
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from random_sampling import RandomStream
+
+PLOT_FORMATS = ('png', 'svg')
+
+def _normalize(weights) -> np.ndarray:
+    # returns the weights of the sides 1..n as probabilities
+    weights = np.asarray(weights, dtype=float)
+    if weights.ndim != 1 or weights.size == 0 or (weights < 0).any() or weights.sum() <= 0:
+        raise ValueError("weights must be non-negative numbers with a positive sum")
+    return weights / weights.sum()
+
+def _alias_tables(probabilities) -> tuple[list[float], list[int]]:
+    # builds the tables of Walker's alias method with Vose's algorithm:
+    # side i is kept with probability prob[i], otherwise alias[i] is taken
+    n = len(probabilities)
+    scaled = [p * n for p in probabilities]
+    prob = [1.0] * n
+    alias = list(range(n))
+    small = [i for i, p in enumerate(scaled) if p < 1]
+    large = [i for i, p in enumerate(scaled) if p >= 1]
+    while small and large:
+        less, more = small.pop(), large.pop()
+        prob[less] = scaled[less]
+        alias[less] = more
+        scaled[more] += scaled[less] - 1
+        (small if scaled[more] < 1 else large).append(more)
+    # the rest have probability 1 up to rounding errors
+    return prob, alias
 
 class Dice:
     """A class used to represent a Dice.
 
+    A fair dice is rolled with randint. A loaded dice is rolled with
+    Walker's alias method: the tables are built once, then every roll
+    takes one uniform number, which picks a side and decides between
+    the side and its alias.
+
     Attributes
     ----------
     sides : int, optional
-        The number of sides the dice has (default 6)
-    
+        The number of sides the dice has (default 6 or the number of weights)
+    weights : tuple[float, ...] | None, optional
+        The weights of the sides 1..n, None for a fair dice (default None)
+    probabilities : np.ndarray
+        The probabilities of the sides 1..n
 
     Methods
     -------
-    roll() -> int
+    roll(rng=None) -> int
         Returns a random integer from one of the sides
+    roll_many(size, rng=None) -> np.ndarray
+        Returns an array of random sides with the given shape
 
     Raises
     ------
     ValueError
-        If the input is not integer greater than 1
+        If sides is not integer greater than 1, the weights are invalid
+        or their number is not equal to sides
     """
 
-    def __init__(self, sides=6):
+    def __init__(self, sides=None, weights=None):
+        if weights is not None:
+            probabilities = _normalize(weights)
+            if sides is None:
+                sides = probabilities.size
+            elif sides != probabilities.size:
+                raise ValueError("the number of weights must be equal to sides")
+        if sides is None:
+            sides = 6
         if not isinstance(sides, int) or sides <= 1:
             raise ValueError("sides must be an integer greater than 1")
         self.sides = sides
+        self.weights: tuple[float, ...] | None = None
+        if weights is None:
+            self.probabilities = np.full(sides, 1 / sides)
+        else:
+            self.weights = tuple(float(w) for w in weights)
+            self.probabilities = probabilities
+            self._prob, self._alias = _alias_tables(probabilities.tolist())
+            self._prob_array = np.array(self._prob)
+            self._alias_array = np.array(self._alias)
+
+    def roll(self, rng=None) -> int:
+        """Returns a random integer from one of the sides. Optionally
+        a RandomStream rng can be used instead of the global random module.
+        """
+        source = random if rng is None else rng.random
+        if self.weights is None:
+            return source.randint(1, self.sides)
+        u = source.random() * self.sides
+        side = int(u)
+        if u - side < self._prob[side]:
+            return side + 1
+        return self._alias[side] + 1
+
+    def roll_many(self, size, rng=None) -> np.ndarray:
+        """Returns an array of random sides with the given size (an int
+        or a shape). Optionally the numpy generator of a RandomStream rng
+        is used.
+        """
+        generator = np.random.default_rng() if rng is None else rng.generator
+        dtype = np.uint8 if self.sides < 256 else np.int64
+        if self.weights is None:
+            return generator.integers(1, self.sides + 1, size=size, dtype=dtype)
+        u = generator.random(size) * self.sides
+        sides = u.astype(np.int64)
+        keep = u - sides < self._prob_array[sides]
+        return (np.where(keep, sides, self._alias_array[sides]) + 1).astype(dtype)
+
+    def __repr__(self):
+        if self.weights is None:
+            return f"Dice(sides={self.sides})"
+        return f"Dice(weights={list(self.weights)})"
+
+# Above this number of products the convolution is computed with FFT
+FFT_THRESHOLD = 50_000
+
+def _dice_distribution(dice) -> np.ndarray:
+    # returns the probabilities of the sides 1..n of a Dice, a number of
+    # sides or a sequence of weights of the sides
+    if isinstance(dice, Dice):
+        return dice.probabilities
+    if isinstance(dice, int):
+        if dice <= 1:
+            raise ValueError("sides must be an integer greater than 1")
+        return np.full(dice, 1 / dice)
+    return _normalize(dice)
+
+def _convolve(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    # the distribution of the sum of two independent distributions
+    if first.size * second.size <= FFT_THRESHOLD:
+        return np.convolve(first, second)
+    size = first.size + second.size - 1
+    fft_size = 1 << (size - 1).bit_length()
+    result = np.fft.irfft(np.fft.rfft(first, fft_size) * np.fft.rfft(second, fft_size),
+                          fft_size)[:size]
+    # FFT rounding errors can be slightly negative
+    result = np.clip(result, 0, None)
+    return result / result.sum()
+
+def _power(distribution: np.ndarray, n: int) -> np.ndarray:
+    # the distribution of the sum of n independent copies by repeated squaring
+    result = np.ones(1)
+    while n:
+        if n & 1:
+            result = _convolve(result, distribution)
+        n >>= 1
+        if n:
+            distribution = _convolve(distribution, distribution)
+    return result
+
+def sum_distribution(dices) -> dict[int, float]:
+    """Returns the exact probabilities of the sums of rolling the dices.
+
+    The distribution of the sum is the convolution of the distributions of
+    the dices. Equal dices are combined by repeated squaring and large
+    convolutions are computed with FFT, so even thousands of dices take
+    only milliseconds.
+
+    Args:
+        dices (Iterable[Dice | int | Sequence[float]]): The dices as Dice
+            objects, numbers of sides (fair dices) or weights of the sides
+            1..n (not necessarily normalized).
 
-    def roll(self) -> int:
-        """Returns a random integer from one of the sides"""
-        return random.randint(1, self.sides)
+    Raises:
+        ValueError: If there are no dices, a number of sides is not greater
+            than 1 or the weights are invalid.
+
+    Returns:
+        dict[int, float]: The probability of every possible sum from the
+            number of dices to the sum of their sides.
+    """
+    groups = Counter()
+    distributions = {}
+    for dice in dices:
+        distribution = _dice_distribution(dice)
+        key = distribution.tobytes()
+        groups[key] += 1
+        distributions[key] = distribution
+    if not groups:
+        raise ValueError("at least one dice is required")
+
+    result = np.ones(1)
+    for key, count in groups.items():
+        result = _convolve(result, _power(distributions[key], count))
+    num_dices = sum(groups.values())
+    return {num_dices + i: float(p) for i, p in enumerate(result)}
+
+def _group_dices(dices) -> list[tuple[Dice, int]]:
+    # equal dices are rolled together as the columns of one array
+    groups = {}
+    for dice in dices:
+        key = (dice.sides, dice.weights)
+        if key in groups:
+            groups[key][1] += 1
+        else:
+            groups[key] = [dice, 1]
+    return [(dice, count) for dice, count in groups.values()]
+
+def _roll_histogram(stream, groups, num_rolls, rows, first_block, last_block):
+    # counts the sums of the blocks from first_block to last_block (exclusive),
+    # every block has rows rolls and is drawn with its own substream
+    max_sum = sum(dice.sides * count for dice, count in groups)
+    counts = np.zeros(max_sum + 1, dtype=np.int64)
+    for block in range(first_block, last_block):
+        size = min(rows, num_rolls - block * rows)
+        rng = stream.substream(block)
+        sums = sum(dice.roll_many((size, count), rng).sum(axis=1, dtype=np.int64)
+                   for dice, count in groups)
+        counts += np.bincount(sums, minlength=max_sum + 1)
+    return counts
 
 class Simulation:
     """A class to represent a simulation of rolling a dice.
@@ -43,30 +241,40 @@ class Simulation:
         The number of dices to be rolled in the simulation
     num_rolls : int
         The number of rolls to be simulated
-    dice_sides : int, optional
-        Number of sides of the dices
+    dice_sides : int | None, optional
+        Number of sides of the dices (None for dices with different sides)
     dices : list[Dice]
         A list with Dice objects for the simulation
     results : dict[int,int]
         A result dict where keys are the possible summed result
         and the values are the occurances of the results in the
         simulation (initially values are 0)
+    seed : int | None, optional
+        The seed of the random stream of the vectorized engine
+    stream : RandomStream
+        The random stream of the vectorized engine, every run uses
+        its next substream
 
     Methods
     -------
-    run() -> None
+    from_dices(dices, num_rolls, seed=None) -> Simulation
+        creates a simulation of rolling the given (loaded or different) dices
+    run(engine='vectorized', chunk_size=1_000_000, workers=1) -> None
         runs the simulation and populates the results with the
         corresponding occurances
+    exact_distribution() -> dict[int, float]
+        returns the exact probabilities of the results
+    plot(filename, fmt=None) -> str
+        saves a bar chart displaying the results into a PNG or SVG file
     __str__() -> str
-        creates and shows a bar chart displaying the results and
-        prints the results of the simulation
+        returns the results of the simulation as text
 
     Raises
     ------
     ValueError
         If the inputs are not integer greater than 0
     """
-    def __init__(self, num_dices: int, num_rolls: int, dice_sides=6):
+    def __init__(self, num_dices: int, num_rolls: int, dice_sides=6, seed=None):
         if not isinstance(num_dices, int) or num_dices <= 0:
             raise ValueError("num_dices must be an integer greater than 0")
         if not isinstance(num_rolls, int) or num_rolls <= 0:
@@ -76,22 +284,131 @@ class Simulation:
         self.dice_sides = dice_sides
         self.dices: list[Dice] = [Dice(dice_sides) for _ in range(num_dices)]
         self.results: dict[int,int] = {i: 0 for i in range(num_dices,num_dices * dice_sides +1)}
+        self.seed = seed
+        self.stream = RandomStream(seed)
+        self._num_runs = 0
+
+    @classmethod
+    def from_dices(cls, dices, num_rolls: int, seed=None) -> 'Simulation':
+        """Creates a simulation of rolling the given dices, which can be
+        loaded and have different numbers of sides.
+
+        Args:
+            dices (Iterable[Dice | int]): The dices as Dice objects or
+                numbers of sides (fair dices).
+            num_rolls (int): The number of rolls to be simulated.
+            seed (int, optional): The seed of the random stream. Defaults to None.
+
+        Raises:
+            ValueError: If there are no dices or the inputs are invalid.
+
+        Returns:
+            Simulation: A simulation with results for every sum from the
+                number of dices to the sum of their sides.
+        """
+        dices = [dice if isinstance(dice, Dice) else Dice(dice) for dice in dices]
+        sim = cls(len(dices), num_rolls, seed=seed)
+        sides = {dice.sides for dice in dices}
+        sim.dice_sides = sides.pop() if len(sides) == 1 else None
+        sim.dices = dices
+        sim.results = {i: 0 for i in range(len(dices), sum(dice.sides for dice in dices) + 1)}
+        return sim
 
-    def run(self) -> None:
+    def run(self, engine='vectorized', chunk_size=1_000_000, workers=1) -> None:
         """For every roll from num_rolls the function summs the
         dices rolled and adds 1 to the corresponding result in the
         results dict
+
+        Args:
+            engine (str, optional): 'vectorized' - the rolls are drawn with
+                numpy in blocks of at most chunk_size dice values, summed
+                along the rows and counted with numpy.bincount;
+                'loop' - every dice of every roll is rolled with Dice.roll.
+                Defaults to 'vectorized'.
+            chunk_size (int, optional): The maximal number of dice values
+                in a block. Defaults to 1_000_000.
+            workers (int, optional): The number of processes of the
+                vectorized engine. The blocks are split between them and
+                their histograms are merged. Every block is drawn with its
+                own substream of the stream, so for a fixed seed the results
+                do not depend on the number of workers. Defaults to 1.
+
+        Raises:
+            ValueError: If the engine is not supported or chunk_size or
+                workers is not a positive integer.
+        """
+        if engine == 'loop':
+            for _ in range(self.num_rolls):
+                temp = sum(dice.roll() for dice in self.dices)
+                self.results[temp] += 1
+        elif engine == 'vectorized':
+            if not isinstance(chunk_size, int) or chunk_size <= 0:
+                raise ValueError("chunk_size must be a positive integer")
+            if not isinstance(workers, int) or workers <= 0:
+                raise ValueError("workers must be a positive integer")
+            self._run_vectorized(chunk_size, workers)
+        else:
+            raise ValueError("engine must be 'vectorized' or 'loop'")
+
+    def _run_vectorized(self, chunk_size, workers):
+        stream = self.stream.substream(self._num_runs)
+        self._num_runs += 1
+        rows = max(1, chunk_size // self.num_dices)
+        num_blocks = -(-self.num_rolls // rows)
+        workers = min(workers, num_blocks)
+        args = (stream, _group_dices(self.dices), self.num_rolls, rows)
+        if workers == 1:
+            counts = _roll_histogram(*args, 0, num_blocks)
+        else:
+            bounds = [num_blocks * k // workers for k in range(workers + 1)]
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_roll_histogram, *args, first, last)
+                           for first, last in zip(bounds[:-1], bounds[1:])]
+                counts = sum(future.result() for future in futures)
+        for result in self.results:
+            self.results[result] += int(counts[result])
+
+    def exact_distribution(self) -> dict[int, float]:
+        """Returns the exact probabilities of the results (see
+        sum_distribution). Multiplied by num_rolls they are the
+        expected results of the simulation.
+        """
+        return sum_distribution(self.dices)
+
+    def plot(self, filename, fmt=None) -> str:
+        """Saves a bar chart displaying the results into a file.
+
+        Args:
+            filename (str | os.PathLike): The path of the image file.
+            fmt (str, optional): 'png' or 'svg'. Defaults to the extension
+                of the filename.
+
+        Raises:
+            ValueError: If the format is not 'png' or 'svg'.
+
+        Returns:
+            str: The path of the saved file.
         """
-        for _ in range(self.num_rolls):
-            temp = sum(dice.roll() for dice in self.dices)
-            self.results[temp] += 1
+        filename = os.fspath(filename)
+        if fmt is None:
+            fmt = os.path.splitext(filename)[1][1:]
+        fmt = fmt.lower()
+        if fmt not in PLOT_FORMATS:
+            raise ValueError("fmt must be 'png' or 'svg'")
+        # Imported here, so importing the module does not load matplotlib
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        figure = Figure()
+        FigureCanvasAgg(figure)
+        axes = figure.add_subplot()
+        axes.bar(list(self.results.keys()), list(self.results.values()))
+        axes.set_title("Dice outcomes")
+        axes.set_xlabel("Sum of rolls")
+        axes.set_ylabel("Num of rolls per outcome")
+        figure.savefig(filename, format=fmt)
+        return filename
 
     def __str__(self):
-        plt.bar(self.results.keys(), self.results.values())
-        plt.title("Dice outcomes")
-        plt.xlabel("Sum of rolls")
-        plt.ylabel("Num of rolls per outcome")
-        plt.show()
         return '\n'.join(f'{k} -> {v} times' for k,v in self.results.items())
 
 def main():
@@ -102,8 +419,9 @@ def main():
     # Run the simulation
     sim.run()
 
-    # Print the results
+    # Print the results and save the bar chart
     print(sim)
+    sim.plot('dice_outcomes.png')
 
 if __name__ == '__main__':
     main()
@@ -1,9 +1,16 @@
 """The module contains an abstract Dataset class and a CSVDataset class.
 It allows loading a CSV file into a pandas DataFrame, clening it from 
 columns with only None values and saving the data into a new CSV file.
+
+The CSVDataset is lazy: the data is fetched, cleaned and transformed on the
+first access. With a chunksize save_data does not load the whole file if it
+is not loaded yet. The columns to be dropped are found with a first pass over
+the chunks of the source file and the cleaned and timestamped chunks are
+streamed into the target file, so only one chunk is in memory at a time.
 """
 from abc import ABC, abstractmethod
 import datetime
+import numpy as np
 import pandas as pd
 
 class Dataset(ABC):
@@ -32,9 +39,15 @@ class Dataset(ABC):
 class CSVDataset(Dataset):
     """A class to represent a CSV dataset.
 
-    While initializing the data from the source file is fetched into a pandas DataFrame.
-    Then columns containing only None values are dropped and a new column 'timestamp'
-    is added to store the current timestamp.
+    The data from the source file is fetched into a pandas DataFrame on the first
+    access of data. Then columns containing only None values are dropped, a new
+    column 'timestamp' is added to store the current timestamp and the added steps
+    are applied. Creating the object does not read the file.
+
+    If chunksize is given and the data is not loaded yet, save_data processes the
+    source file in chunks of chunksize rows, unless a step needs the whole data.
+    The same columns as in the whole DataFrame are dropped and all rows get the
+    same timestamp.
 
     
     Arguments
@@ -43,18 +56,26 @@ class CSVDataset(Dataset):
         A source file to be read
     target_filepath : str
         A target CSV file for the data to be saved in
+    chunksize : int | None, optional
+        The number of rows in a chunk, None to fetch the whole file (default None)
+    data : pd.DataFrame
+        The cleaned and transformed data, loaded on the first access
     
     Methods
     -------
+    add_step(func, chunkwise=True) -> None
+        Adds a step which transforms the data after the cleaning and the timestamp
     save_data() -> None
         Saves the loaded, cleaned and transformed data to the target filepath
     """
-    def __init__(self, src_filepath, target_filepath):
+    def __init__(self, src_filepath, target_filepath, chunksize=None):
+        if chunksize is not None and (not isinstance(chunksize, int) or chunksize <= 0):
+            raise ValueError("chunksize must be a positive integer")
         self.src_filepath = src_filepath
         self.target_filepath = target_filepath
-        self.data: pd.DataFrame = self._fetch_data()
-        self._clean_data()
-        self._transform_data()
+        self.chunksize = chunksize
+        self._data: pd.DataFrame | None = None
+        self._steps: list[tuple] = []
 
     @property
     def src_filepath(self):
@@ -74,23 +95,105 @@ class CSVDataset(Dataset):
     def target_filepath(self, value):
         self._target_filepath = value
 
+    @property
+    def data(self):
+        """The cleaned and transformed data, fetched on the first access"""
+        if self._data is None:
+            self._data = self._fetch_data()
+            try:
+                self._clean_data()
+                self._transform_data()
+                for func, _ in self._steps:
+                    self._data = func(self._data)
+            except BaseException:
+                # a half processed DataFrame is not kept, the next access starts again
+                self._data = None
+                raise
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        self._data = value
+
+    def add_step(self, func, chunkwise=True):
+        """Adds a step which transforms the data after the cleaning and the timestamp.
+        If the data is already loaded the step is applied immediately.
+
+        Args:
+            func (Callable[[pd.DataFrame], pd.DataFrame]): A function which
+                returns the transformed DataFrame.
+            chunkwise (bool, optional): If the step can be applied to every chunk
+                separately. A step which needs the whole data (e.g. sorting or
+                removing duplicates) prevents saving the data in chunks.
+                Defaults to True.
+        """
+        if self._data is not None:
+            self._data = func(self._data)
+        self._steps.append((func, chunkwise))
+
     def _fetch_data(self):
         return pd.read_csv(self.src_filepath)
 
+    def _fetch_chunks(self, dtype=None):
+        return pd.read_csv(self.src_filepath, chunksize=self.chunksize, dtype=dtype)
+
+    def _column_stats(self):
+        # the columns with a missing value in any chunk, like dropna(axis="columns")
+        # on the whole DataFrame, and the dtypes of the columns in all chunks, because
+        # pandas infers the dtypes of every chunk separately (e.g. int and float)
+        missing = None
+        dtypes = {}
+        for chunk in self._fetch_chunks():
+            chunk_missing = chunk.isna().any()
+            missing = chunk_missing if missing is None else missing | chunk_missing
+            for column, dtype in chunk.dtypes.items():
+                dtypes[column] = _common_dtype(dtypes.get(column, dtype), dtype)
+        return list(missing[missing].index), dtypes
+
     def _transform_data(self):
-        self.data['timestamp'] = datetime.datetime.now()
+        self._data['timestamp'] = datetime.datetime.now()
 
     def _clean_data(self):
-        self.data.dropna(axis = "columns",inplace=True)
+        self._data.dropna(axis = "columns",inplace=True)
+
+    def _can_stream(self):
+        return (self._data is None and self.chunksize is not None
+                and all(chunkwise for _, chunkwise in self._steps))
+
+    def _stream_data(self):
+        dropped_columns, dtypes = self._column_stats()
+        timestamp = datetime.datetime.now()
+        # The index of the chunks continues, the header is written only once
+        for i, chunk in enumerate(self._fetch_chunks(dtypes)):
+            chunk = chunk.drop(columns=dropped_columns)
+            chunk['timestamp'] = timestamp
+            for func, _ in self._steps:
+                chunk = func(chunk)
+            chunk.to_csv(self.target_filepath, mode='w' if i == 0 else 'a', header=i == 0)
 
     def __str__(self):
         return str(self.data)
 
     def __repr__(self):
-        return f"Data is fetched from '{self.src_filepath}':" + "\n" + str(self.data)
+        if self._data is None:
+            return f"Data is fetched from '{self.src_filepath}' on the first access"
+        return f"Data is fetched from '{self.src_filepath}':" + "\n" + str(self._data)
 
     def save_data(self):
-        self.data.to_csv(self.target_filepath)
+        if self._can_stream():
+            self._stream_data()
+        else:
+            self.data.to_csv(self.target_filepath)
+
+def _common_dtype(first, second):
+    # the dtype of a column which has values of both dtypes, only numbers are
+    # widened (e.g. int and float), other mixes are read as object like in the
+    # whole file (bool with int is not widened, True and False stay as they are)
+    if first == second:
+        return first
+    if first.kind in 'iuf' and second.kind in 'iuf':
+        return np.result_type(first, second)
+    return np.dtype(object)
 
 def main():
     """Test"""
@@ -1,7 +1,16 @@
 """The module contains the class Distance. The objects from the class
 represent a linear distance in form 'm sm mm' and can be added and
-substacted from each other.
+substacted from each other. The class DistanceArray holds many distances
+in a numpy array and does the same arithmetic on all of them at once.
+
+A distance is stored as a single integer number of milimeters, the meters,
+centimeters and milimeters are computed from it when they are read. The
+results of the arithmetic are created with a constructor which skips the
+validation, because the sum or the difference of valid distances is valid.
 """
+import operator
+import numpy as np
+
 class Distance:
     """Represents a Distance object in form 'm cm mm'.
     ...
@@ -14,57 +23,89 @@ class Distance:
 
     milimeters : int
 
+    total_milimeters : int
+        The whole distance in milimeters
+
+    Methods
+    -------
+    sum(distances) -> Distance
+        Returns the sum of the distances
+
+    Distances are compared and hashed by their total milimeters, so they can
+    be sorted and used in sets and as dict keys. A distance is mutable (with
+    the setters, += and -=), it must not be changed while it is in a set or a
+    dict key, because its hash changes with it.
+
     Raises
     ------
     ValueError
         If value is not a positive integer
     """
+    __slots__ = ('_total',)
+
     def __init__(self, meters: int, centimeters: int, milimeters: int):
-        self.meters = meters
-        self.centimeters = centimeters
-        self.milimeters = milimeters
-        self._distribute()
-
-    def _distribute(self):
-        # a method called after initialization which distributes the metrics in
-        # the correct way
-        self.meters = self.meters + (self.centimeters + self.milimeters // 10) // 100
-        self.centimeters = (self.centimeters + self.milimeters // 10) % 100
-        self.milimeters = self.milimeters % 10
-        self.total_milimeters = self.meters * 1000 + self.centimeters * 10 + self.milimeters
+        for value in (meters, centimeters, milimeters):
+            _validate(value)
+        self._total = meters * 1000 + centimeters * 10 + milimeters
+
+    @classmethod
+    def _from_milimeters(cls, total: int) -> 'Distance':
+        # creates a distance from a valid number of milimeters without validation
+        result = object.__new__(cls)
+        result._total = total
+        return result
+
+    @classmethod
+    def sum(cls, distances) -> 'Distance':
+        """Returns the sum of an iterable of distances. The milimeters are
+        added as integers and only the result is created as a Distance.
+        """
+        if isinstance(distances, DistanceArray):
+            return distances.sum()
+        return cls._from_milimeters(sum(distance._total for distance in distances))
+
+    @property
+    def total_milimeters(self):
+        """The whole distance in milimeters."""
+        return self._total
+
+    @total_milimeters.setter
+    def total_milimeters(self, value):
+        _validate(value)
+        self._total = value
+
+    # Setting one of the components keeps the others and the result is
+    # distributed immediately, e.g. setting 150 centimeters adds 1 meter
 
     @property
     def meters(self):
         """How much meters does the distance have."""
-        return self._meters
+        return self._total // 1000
 
     @meters.setter
     def meters(self, value):
-        if not isinstance(value, int) or value < 0:
-            raise ValueError("meters, centimeters and milimeters must be non-negative integers")
-        self._meters = value
+        _validate(value)
+        self._total = value * 1000 + self._total % 1000
 
     @property
     def centimeters(self):
         """How much centimeters does the distance have."""
-        return self._centimeters
+        return self._total // 10 % 100
 
     @centimeters.setter
     def centimeters(self, value):
-        if not isinstance(value, int) or value < 0:
-            raise ValueError("meters, centimeters and milimeters must be non-negative integers")
-        self._centimeters = value
+        _validate(value)
+        self._total += (value - self._total // 10 % 100) * 10
 
     @property
     def milimeters(self):
         """How much milimeters does the distance have."""
-        return self._milimeters
+        return self._total % 10
 
     @milimeters.setter
     def milimeters(self, value):
-        if not isinstance(value, int) or value < 0:
-            raise ValueError("meters, centimeters and milimeters must be non-negative integers")
-        self._milimeters = value
+        _validate(value)
+        self._total += value - self._total % 10
 
     def __str__(self):
         return f"{self.meters}m {self.centimeters}cm {self.milimeters}mm"
@@ -73,35 +114,304 @@ class Distance:
         return f"{self.meters}m {self.centimeters}cm {self.milimeters}mm"
 
     def __add__(self, other: 'Distance'):
-        result: Distance = Distance(0,0,0)
-        result.milimeters = self.total_milimeters + other.total_milimeters
-        result._distribute()
-        return result
+        try:
+            return Distance._from_milimeters(self._total + other._total)
+        except AttributeError:
+            return NotImplemented
+
+    def __radd__(self, other):
+        # allows the builtin sum, which starts with 0
+        if other == 0 and not isinstance(other, Distance):
+            return Distance._from_milimeters(self._total)
+        return NotImplemented
 
     def __iadd__(self, other: 'Distance'):
-        self.milimeters += other.total_milimeters
-        self._distribute()
+        try:
+            self._total += other._total
+        except AttributeError:
+            return NotImplemented
         return self
 
     def __sub__(self, other: 'Distance'):
-        result: Distance = Distance(0,0,0)
         try:
-            result.milimeters = self.total_milimeters - other.total_milimeters
-        except ValueError as exc:
-            raise ValueError("Resulting distance cannot be negative") from exc
-        result._distribute()
-        return result
+            total = self._total - other._total
+        except AttributeError:
+            return NotImplemented
+        if total < 0:
+            raise ValueError("Resulting distance cannot be negative")
+        return Distance._from_milimeters(total)
 
     def __isub__(self, other: 'Distance'):
         try:
-            self.meters = 0
-            self.centimeters = 0
-            self.milimeters = self.total_milimeters - other.total_milimeters
-        except ValueError as exc:
-            raise ValueError("Resulting distance cannot be negative") from exc
-        self._distribute()
+            total = self._total - other._total
+        except AttributeError:
+            return NotImplemented
+        if total < 0:
+            raise ValueError("Resulting distance cannot be negative")
+        self._total = total
+        return self
+
+    def __eq__(self, other):
+        if not isinstance(other, Distance):
+            return NotImplemented
+        return self._total == other._total
+
+    def __ne__(self, other):
+        if not isinstance(other, Distance):
+            return NotImplemented
+        return self._total != other._total
+
+    def __lt__(self, other):
+        if not isinstance(other, Distance):
+            return NotImplemented
+        return self._total < other._total
+
+    def __le__(self, other):
+        if not isinstance(other, Distance):
+            return NotImplemented
+        return self._total <= other._total
+
+    def __gt__(self, other):
+        if not isinstance(other, Distance):
+            return NotImplemented
+        return self._total > other._total
+
+    def __ge__(self, other):
+        if not isinstance(other, Distance):
+            return NotImplemented
+        return self._total >= other._total
+
+    def __hash__(self):
+        return hash(self._total)
+
+def _validate(value):
+    # checks a number of meters, centimeters or milimeters
+    if not isinstance(value, int) or value < 0:
+        raise ValueError("meters, centimeters and milimeters must be non-negative integers")
+
+# The longest distance in a DistanceArray in milimeters
+_INT64_MAX = int(np.iinfo(np.int64).max)
+
+class DistanceArray:
+    """Represents a sequence of distances stored as a numpy int64 array
+    of milimeters.
+    ...
+
+    The operators work on all distances at once: + and - with another
+    DistanceArray of the same length or with a single Distance, * with a
+    non-negative integer. Negative results are checked for the whole
+    array with one comparison.
+
+    Attributes
+    ----------
+    total_milimeters : np.ndarray
+        A read-only view of the distances in milimeters
+
+    meters : np.ndarray
+
+    centimeters : np.ndarray
+
+    milimeters : np.ndarray
+
+    Methods
+    -------
+    from_distances(distances) -> DistanceArray
+        Creates an array from Distance objects
+    to_distances() -> list[Distance]
+        Returns the distances as Distance objects
+    sum() -> Distance
+        Returns the sum of the distances
+    min() -> Distance
+        Returns the shortest distance
+    max() -> Distance
+        Returns the longest distance
+    cumsum() -> DistanceArray
+        Returns the cumulative sums of the distances
+
+    Raises
+    ------
+    ValueError
+        If the milimeters are not non-negative integers or a result is negative
+    """
+    __slots__ = ('_milimeters',)
+    # numpy scalars on the left defer to the reflected operators instead of
+    # treating the array as a sequence of Distance objects
+    __array_ufunc__ = None
+
+    def __init__(self, milimeters=()):
+        values = np.asarray(milimeters)
+        if values.size == 0:
+            values = values.astype(np.int64)
+        if (values.ndim != 1 or values.dtype.kind not in 'iu' or (values < 0).any()
+                or (values.dtype.kind == 'u' and values.size
+                    and values.max() > _INT64_MAX)):
+            raise ValueError("milimeters must be a sequence of non-negative integers")
+        self._milimeters = values.astype(np.int64)
+
+    @classmethod
+    def _from_array(cls, milimeters: np.ndarray) -> 'DistanceArray':
+        # creates an array from a valid int64 array without validation or copy
+        result = object.__new__(cls)
+        result._milimeters = milimeters
+        return result
+
+    @classmethod
+    def from_distances(cls, distances) -> 'DistanceArray':
+        """Creates an array from an iterable of Distance objects."""
+        return cls._from_array(np.fromiter((d.total_milimeters for d in distances),
+                                           dtype=np.int64))
+
+    def to_distances(self) -> list[Distance]:
+        """Returns the distances as a list of Distance objects."""
+        return [Distance._from_milimeters(total) for total in self._milimeters.tolist()]
+
+    @property
+    def total_milimeters(self) -> np.ndarray:
+        """A read-only view of the distances in milimeters."""
+        view = self._milimeters.view()
+        view.flags.writeable = False
+        return view
+
+    @property
+    def meters(self) -> np.ndarray:
+        """How much meters does every distance have."""
+        return self._milimeters // 1000
+
+    @property
+    def centimeters(self) -> np.ndarray:
+        """How much centimeters does every distance have."""
+        return self._milimeters // 10 % 100
+
+    @property
+    def milimeters(self) -> np.ndarray:
+        """How much milimeters does every distance have."""
+        return self._milimeters % 10
+
+    def _sum_fits(self) -> bool:
+        # if the sum (and every cumulative sum) of the distances fits in int64
+        return not self._milimeters.size or \
+            self._milimeters.max() <= _INT64_MAX // len(self._milimeters) or \
+            sum(self._milimeters.tolist()) <= _INT64_MAX
+
+    def sum(self) -> Distance:
+        """Returns the sum of the distances."""
+        if not self._sum_fits():
+            # a Distance is not limited to int64
+            return Distance._from_milimeters(sum(self._milimeters.tolist()))
+        return Distance._from_milimeters(int(self._milimeters.sum()))
+
+    def min(self) -> Distance:
+        """Returns the shortest distance."""
+        if not self._milimeters.size:
+            raise ValueError("min of an empty DistanceArray")
+        return Distance._from_milimeters(int(self._milimeters.min()))
+
+    def max(self) -> Distance:
+        """Returns the longest distance."""
+        if not self._milimeters.size:
+            raise ValueError("max of an empty DistanceArray")
+        return Distance._from_milimeters(int(self._milimeters.max()))
+
+    def cumsum(self) -> 'DistanceArray':
+        """Returns the cumulative sums of the distances."""
+        if not self._sum_fits():
+            raise ValueError("Resulting distance is too long")
+        return DistanceArray._from_array(self._milimeters.cumsum())
+
+    def _operand(self, other):
+        # the milimeters of a DistanceArray with the same length or a Distance
+        if isinstance(other, DistanceArray):
+            if len(other._milimeters) != len(self._milimeters):
+                raise ValueError("DistanceArrays must have the same length")
+            return other._milimeters
+        if isinstance(other, Distance):
+            if other.total_milimeters > _INT64_MAX:
+                raise ValueError("Resulting distance is too long")
+            return other.total_milimeters
+        return None
+
+    def _added(self, milimeters) -> np.ndarray:
+        # the sum with an array or a number, the values are non-negative, so
+        # the sum overflows exactly if a value is above the maximum minus the other
+        if (self._milimeters > _INT64_MAX - milimeters).any():
+            raise ValueError("Resulting distance is too long")
+        return self._milimeters + milimeters
+
+    @staticmethod
+    def _checked(milimeters: np.ndarray) -> np.ndarray:
+        if (milimeters < 0).any():
+            raise ValueError("Resulting distance cannot be negative")
+        return milimeters
+
+    def __len__(self):
+        return len(self._milimeters)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return DistanceArray._from_array(self._milimeters[index])
+        return Distance._from_milimeters(int(self._milimeters[index]))
+
+    def __iter__(self):
+        return iter(self.to_distances())
+
+    def __str__(self):
+        if len(self) > 6:
+            items = [*self[:3], '...', *self[-3:]]
+        else:
+            items = list(self)
+        return f"[{', '.join(map(str, items))}]"
+
+    def __repr__(self):
+        return f"DistanceArray({self})"
+
+    def __add__(self, other):
+        milimeters = self._operand(other)
+        if milimeters is None:
+            return NotImplemented
+        return DistanceArray._from_array(self._added(milimeters))
+
+    __radd__ = __add__
+
+    def __iadd__(self, other):
+        milimeters = self._operand(other)
+        if milimeters is None:
+            return NotImplemented
+        self._milimeters = self._added(milimeters)
+        return self
+
+    def __sub__(self, other):
+        milimeters = self._operand(other)
+        if milimeters is None:
+            return NotImplemented
+        return DistanceArray._from_array(self._checked(self._milimeters - milimeters))
+
+    def __rsub__(self, other):
+        milimeters = self._operand(other)
+        if milimeters is None:
+            return NotImplemented
+        return DistanceArray._from_array(self._checked(milimeters - self._milimeters))
+
+    def __isub__(self, other):
+        milimeters = self._operand(other)
+        if milimeters is None:
+            return NotImplemented
+        self._milimeters = self._checked(self._milimeters - milimeters)
         return self
 
+    def __mul__(self, factor: int):
+        if isinstance(factor, (bool, np.bool_)) or not isinstance(factor, (int, np.integer)):
+            return NotImplemented
+        # a Python int keeps the product int64, numpy unsigned factors would make it float
+        factor = operator.index(factor)
+        if factor < 0:
+            raise ValueError("Resulting distance cannot be negative")
+        if factor and self._milimeters.size and \
+                self._milimeters.max() > _INT64_MAX // factor:
+            raise ValueError("Resulting distance is too long")
+        return DistanceArray._from_array(self._milimeters * factor)
+
+    __rmul__ = __mul__
+
 def main():
     """Test with some examples"""
     d1 = Distance(1, 150, 150)
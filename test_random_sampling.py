@@ -0,0 +1,65 @@
+"""Test cases for the random_sampling module."""
+
+import datetime
+import importlib
+import pytest
+import numpy as np
+from random_sampling import RandomStream, DateSampler
+
+data_helper = importlib.import_module('data-helper')
+
+def test_random_stream_reproducible():
+    """Test if streams with the same seed and stream id produce the same values."""
+    stream1 = RandomStream(42, 3)
+    stream2 = RandomStream(42, 3)
+    assert stream1.random.random() == stream2.random.random()
+    assert (stream1.generator.integers(0, 100, 10) == stream2.generator.integers(0, 100, 10)).all()
+    assert RandomStream(42, 4).random.random() != RandomStream(42, 3).random.random()
+
+def test_random_stream_spawn():
+    """Test if the spawned streams are the substreams of the stream."""
+    stream = RandomStream()
+    children = stream.spawn(3)
+    assert [child.stream_id for child in children] == [(0,), (1,), (2,)]
+    assert all(child.seed == stream.seed for child in children)
+    assert children[1].substream(5).stream_id == (1, 5)
+
+def test_random_stream_value_error():
+    """Test if the RandomStream class raises a ValueError when the stream id is negative."""
+    with pytest.raises(ValueError, match="stream_id must be a non-negative integer"):
+        RandomStream(1, -1)
+
+def test_data_helper_with_stream():
+    """Test if the data-helper functions return the same values for equal streams."""
+    def draw(rng):
+        return [data_helper.get_random_date(rng), data_helper.get_random_string(rng),
+                data_helper.get_random_integer(rng), data_helper.get_random_double(rng)]
+    assert draw(RandomStream(5)) == draw(RandomStream(5))
+
+def test_date_sampler_range():
+    """Test if the DateSampler class draws every date of the range and only those."""
+    sampler = DateSampler(datetime.date(1900, 2, 27), datetime.date(1900, 3, 2))
+    stream = RandomStream(1)
+    dates = {sampler.sample(stream) for _ in range(200)}
+    assert dates == set(sampler.sample_strings(1000, stream))
+    # 1900 is not a leap year
+    assert dates == {'1900-02-27', '1900-02-28', '1900-03-01', '1900-03-02'}
+
+def test_date_sampler_sample_many():
+    """Test if the sample_many method returns datetime64 values within the range."""
+    sampler = DateSampler(datetime.date(2000, 1, 1), datetime.date(2000, 12, 31))
+    dates = sampler.sample_many(1000, RandomStream(3))
+    assert dates.dtype == np.dtype('datetime64[D]')
+    assert dates.min() >= np.datetime64('2000-01-01') and dates.max() <= np.datetime64('2000-12-31')
+
+def test_date_sampler_large_range():
+    """Test if the DateSampler class works for ranges without a lookup table."""
+    sampler = DateSampler(datetime.date(1, 1, 1), datetime.date(9999, 12, 31))
+    stream = RandomStream(4)
+    for date in [sampler.sample(stream)] + sampler.sample_strings(100, stream):
+        assert len(date) == 10 and datetime.date.fromisoformat(date)
+
+def test_date_sampler_value_error():
+    """Test if the DateSampler class raises a ValueError when start is after end."""
+    with pytest.raises(ValueError, match="start must not be after end"):
+        DateSampler(datetime.date(2001, 1, 1), datetime.date(2000, 1, 1))
@@ -3,6 +3,7 @@
 import os
 import t1_generators as t1
 import pytest
+from random_sampling import RandomStream
 
 def test_random_word_length():
     """Test if the random_word function returns a string with the correct length."""
@@ -56,3 +57,62 @@ def test_write_into_csv():
     with open('test.csv', mode='r', encoding='utf-8') as file:
         assert len(list(file)) == 3
     os.remove('test.csv')
+
+def test_generate_random_chunks():
+    """Test if the generate_random_chunks function yields chunks with
+    the correct number of correctly formatted rows."""
+    chunks = list(t1.generate_random_chunks(25, word_length=5, chunk_size=10))
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    rows = [row for chunk in chunks for row in chunk]
+    for i, row in enumerate(rows, start=1):
+        num, word, date, boolean = (field.strip('"') for field in row.split(', '))
+        assert num == str(i)
+        assert len(word) == 5 and word.isalpha() and word.islower()
+        assert t1.datetime.date.fromisoformat(date).year in range(1900, 2026)
+        assert boolean in ["True", "False"]
+
+def test_generate_random_chunks_value_error():
+    """Test if the generate_random_chunks function raises a ValueError
+    when the inputs are not integers or are not positive."""
+    with pytest.raises(ValueError, match="word_length must be a positive integer"):
+        t1.generate_random_chunks(3, word_length=0)
+    with pytest.raises(ValueError, match="chunk_size must be a positive integer"):
+        t1.generate_random_chunks(3, chunk_size=-1)
+
+def test_write_into_csv_workers(tmp_path):
+    """Test if the write_into_csv function with a process pool writes
+    all rows in order and is reproducible for a fixed seed."""
+    path = tmp_path / 'test.csv'
+    t1.write_into_csv(path, 25, chunk_size=4, workers=3, seed=7)
+    with open(path, mode='r', encoding='utf-8') as file:
+        rows = file.read().splitlines()
+    assert [row.split(', ')[0] for row in rows] == [f'"{i}"' for i in range(1, 26)]
+    assert sorted(os.listdir(tmp_path)) == ['test.csv']
+
+    t1.write_into_csv(path, 25, chunk_size=4, workers=3, seed=7)
+    with open(path, mode='r', encoding='utf-8') as file:
+        assert file.read().splitlines() == rows
+
+def test_write_into_csv_independent_of_workers(tmp_path):
+    """Test if the write_into_csv function writes the same file
+    for a fixed seed irrespective of the number of workers."""
+    contents = []
+    for workers in (1, 2, 3):
+        path = tmp_path / f'test{workers}.csv'
+        t1.write_into_csv(path, 50, chunk_size=7, workers=workers, seed=11)
+        contents.append(path.read_bytes())
+    assert contents[0] == contents[1] == contents[2]
+
+def test_random_functions_with_stream():
+    """Test if the random functions return the same values for equal streams."""
+    def draw(rng):
+        return [t1.random_word(rng=rng), t1.random_date(rng=rng), t1.random_bool(rng=rng)]
+    assert draw(RandomStream(3, 1)) == draw(RandomStream(3, 1))
+    assert list(t1.generate_random_data(20, rng=RandomStream(3))) == \
+        list(t1.generate_random_data(20, rng=RandomStream(3)))
+
+def test_write_into_csv_value_error():
+    """Test if the write_into_csv function raises a ValueError
+    when the number of workers is not a positive integer."""
+    with pytest.raises(ValueError, match="workers must be a positive integer"):
+        t1.write_into_csv('test.csv', 3, workers=0)
@@ -0,0 +1,86 @@
+"""Test cases for the t2_lambdas module."""
+
+import numpy as np
+import pytest
+import t2_lambdas as t2
+
+def test_lambda_3():
+    """Test if the lambda_3 function returns the common elements of two lists."""
+    assert t2.lambda_3()([1, 11, 23, 44, 16], [2, 3, 5, 6, 7, 8, 44, 16]) == [44, 16]
+
+@pytest.mark.parametrize("method", ["hash", "sorted"])
+def test_intersect(method):
+    """Test if the intersect function keeps the order of x and optionally the duplicates."""
+    x = [5, 1, 3, 5, 2, 1, 9]
+    y = [9, 5, 1, 7]
+    assert t2.intersect(x, y, method=method) == [5, 1, 5, 1, 9]
+    assert t2.intersect(x, y, keep_duplicates=False, method=method) == [5, 1, 9]
+
+def test_intersect_numpy():
+    """Test if the intersect function works with numpy arrays."""
+    result = t2.intersect(np.array([5, 1, 3, 5, 2, 1, 9]), [9, 5, 1, 7], method='numpy')
+    assert isinstance(result, np.ndarray)
+    assert result.tolist() == [5, 1, 5, 1, 9]
+    result = t2.intersect([5, 1, 3, 5, 2, 1, 9], [9, 5, 1, 7], keep_duplicates=False,
+                          method='numpy')
+    assert result.tolist() == [5, 1, 9]
+
+def test_intersect_unhashable():
+    """Test if the intersect function works with unhashable elements."""
+    x = [[1], [2], [1], [3]]
+    assert t2.intersect(x, [[3], [1]]) == [[1], [1], [3]]
+    assert t2.intersect(x, [[3], [1]], keep_duplicates=False) == [[1], [3]]
+
+def test_intersect_value_error():
+    """Test if the intersect function raises a ValueError for an unknown method."""
+    with pytest.raises(ValueError, match="method must be 'hash', 'sorted' or 'numpy'"):
+        t2.intersect([1], [1], method='merge')
+
+SENTENCE = 'This is a lAmBdA FuNction task'
+
+def test_word_features():
+    """Test if the word_features function yields the rows of lambda_1 for a generator."""
+    rows = t2.word_features(word for word in SENTENCE.split())
+    assert [list(row) for row in rows] == t2.lambda_1()(SENTENCE.split())
+
+def test_word_feature_columns():
+    """Test if the word_feature_columns function returns the columns of lambda_1."""
+    columns = t2.word_feature_columns(SENTENCE.split())
+    expected = t2.lambda_1()(SENTENCE.split())
+    assert list(zip(*(columns[name].tolist() for name in ('word', 'upper', 'lower', 'length')))) \
+        == [tuple(row) for row in expected]
+
+def test_word_feature_batches():
+    """Test if the word_feature_batches function yields the columns in batches."""
+    batches = list(t2.word_feature_batches(iter(SENTENCE.split()), batch_size=4))
+    assert [batch['word'].tolist() for batch in batches] == \
+        [['This', 'is', 'a', 'lAmBdA'], ['FuNction', 'task']]
+    assert batches[1]['length'].tolist() == [8, 4]
+    with pytest.raises(ValueError, match="batch_size must be a positive integer"):
+        t2.word_feature_batches([], batch_size=0)
+
+def test_word_feature_columns_special_words():
+    """Test if the word_feature_columns function works for words which contain
+    the separator or change their length and for no words."""
+    columns = t2.word_feature_columns(['Straße', 'a\x00B', ''])
+    assert columns['upper'].tolist() == ['STRASSE', 'A\x00B', '']
+    assert columns['lower'].tolist() == ['straße', 'a\x00b', '']
+    assert columns['length'].tolist() == [6, 3, 0]
+    assert t2.word_feature_columns([])['word'].tolist() == []
+
+def test_lambda_4_empty_words():
+    """Test if the lambda_4 function sorts empty words first instead of failing."""
+    assert t2.lambda_4()(['ab', '', 'ba']) == ['', 'ba', 'ab']
+
+@pytest.mark.parametrize("method", ["bucket", "numpy"])
+def test_sort_by_last_char(method):
+    """Test if the sort_by_last_char function sorts like lambda_4 and is stable."""
+    words = SENTENCE.split() + ['', 'ab', 'cb', 'Zb', 'ä', 'bb', '']
+    result = t2.sort_by_last_char(words, method=method)
+    assert list(result) == t2.lambda_4()(words)
+    assert len(t2.sort_by_last_char([], method=method)) == 0
+
+def test_sort_by_last_char_value_error():
+    """Test if the sort_by_last_char function raises a ValueError for an unknown method."""
+    with pytest.raises(ValueError, match="method must be 'bucket' or 'numpy'"):
+        t2.sort_by_last_char(['a'], method='radix')
@@ -1,5 +1,10 @@
 """Test cases for the t3_anonimize_json module."""
 
+import io
+import sys
+import json
+import pickle
+import pytest
 import t3_anonimize_json
 
 def test_anonimize_name():
@@ -46,3 +51,191 @@ def test_anonimize_name():
         {"name": None, "age": 25},
         {"name": None, "age": 35}
         ]
+
+def test_anonimize_stream(tmp_path):
+    """Test if the anonimize_stream function gives the same result as
+    anonimize_name for data.json, also with tokens split between chunks."""
+    with open('data.json', mode='r', encoding='utf-8') as file:
+        expected = json.load(file)
+    t3_anonimize_json.anonimize_name(expected)
+    for chunk_size in (7, 1 << 16):
+        target = tmp_path / 'anonimized.json'
+        t3_anonimize_json.anonimize_stream('data.json', target, chunk_size=chunk_size)
+        with open(target, mode='r', encoding='utf-8') as file:
+            assert json.load(file) == expected
+
+def test_anonimize_stream_file_objects():
+    """Test if the anonimize_stream function replaces values of any type,
+    keeps the other tokens and accepts file objects."""
+    src = io.StringIO('{"name": {"first": "John", "name": "x"}, "na\\u006de": [1, {"a": 2}],'
+                      ' "names": ["Alice"], "n": "name", "friends": [{"name" : "Bob"}]}')
+    dst = io.StringIO()
+    t3_anonimize_json.anonimize_stream(src, dst, chunk_size=5)
+    assert dst.getvalue() == ('{"name": null, "na\\u006de": null, "names": ["Alice"],'
+                              ' "n": "name", "friends": [{"name" : null}]}')
+
+def test_anonimize_stream_value_error():
+    """Test if the anonimize_stream function raises a ValueError for invalid json."""
+    with pytest.raises(ValueError, match="unexpected end of json text"):
+        t3_anonimize_json.anonimize_stream(io.StringIO('[{"name": {"a": 1'), io.StringIO())
+
+def test_anonimize_keys_and_policies():
+    """Test if the anonimize function replaces the values of all sensitive keys
+    according to the policy and counts them."""
+    def data():
+        return {"name": "John", "email": "j@x.com", "age": 30,
+                "friends": [{"name": "Alice", "email": None}, {"name": "John"}]}
+    result = data()
+    assert t3_anonimize_json.anonimize(result, keys={'name', 'email'}) == {'name': 3, 'email': 2}
+    assert result == {"name": None, "email": None, "age": 30,
+                      "friends": [{"name": None, "email": None}, {"name": None}]}
+
+    result = data()
+    t3_anonimize_json.anonimize(result, policy='token')
+    assert result["friends"][0]["name"] == t3_anonimize_json.REDACTED
+
+    result = data()
+    t3_anonimize_json.anonimize(result, policy='hash')
+    assert result["name"] == result["friends"][1]["name"] != result["friends"][0]["name"]
+    assert len(result["name"]) == 64
+
+    result = data()
+    t3_anonimize_json.anonimize(result, policy=len)
+    assert result["friends"][0]["name"] == 5
+
+    with pytest.raises(ValueError, match="policy must be None, 'hash', 'token' or a callable"):
+        t3_anonimize_json.anonimize(data(), policy='unknown')
+
+def test_anonimize_deep_nesting():
+    """Test if the anonimize function works with data deeper than the recursion limit."""
+    data = {"name": "John"}
+    for _ in range(sys.getrecursionlimit() * 2):
+        data = {"child": [data]}
+    assert t3_anonimize_json.anonimize(data) == {'name': 1}
+
+def test_anonimize_stream_keys_and_policies():
+    """Test if the anonimize_stream function replaces and counts the values
+    like the anonimize function."""
+    text = '[{"name": "John", "email": ["j@x.com"], "friends": [{"e\\u006dail": "a@x.com"}]}]'
+    expected = json.loads(text)
+    counts = t3_anonimize_json.anonimize(expected, keys={'name', 'email'}, policy='hash')
+    dst = io.StringIO()
+    assert t3_anonimize_json.anonimize_stream(io.StringIO(text), dst, keys={'name', 'email'},
+                                              policy='hash') == counts
+    assert json.loads(dst.getvalue()) == expected
+
+def test_anonimize_parallel(tmp_path):
+    """Test if the anonimize_parallel function anonimizes all records of
+    data.json and keeps their order."""
+    with open('data.json', mode='r', encoding='utf-8') as file:
+        expected = json.load(file)
+    counts = t3_anonimize_json.anonimize(expected, policy='hash')
+    target = tmp_path / 'anonimized.json'
+    assert t3_anonimize_json.anonimize_parallel('data.json', target, workers=2,
+                                                batch_size=37, policy='hash') == counts
+    with open(target, mode='r', encoding='utf-8') as file:
+        assert json.load(file) == expected
+
+def test_anonimize_parallel_value_error():
+    """Test if the anonimize_parallel function raises a ValueError when
+    the json text is not a top level array."""
+    with pytest.raises(ValueError, match="the json text must be a top level array"):
+        t3_anonimize_json.anonimize_parallel(io.StringIO('{"name": "John"}'), io.StringIO(),
+                                             workers=1)
+    dst = io.StringIO()
+    t3_anonimize_json.anonimize_parallel(io.StringIO(' [ ] '), dst, workers=1)
+    assert json.loads(dst.getvalue()) == []
+
+@pytest.mark.parametrize("backend", ["json", "auto"])
+def test_dump_json_styles(tmp_path, backend):
+    """Test if the dump_json function writes the data in every style."""
+    data = [{"name": None, "city": "Sofia", "friends": [{"name": "Ана"}]}, {"id": 1}]
+    path = tmp_path / 'data.json'
+    t3_anonimize_json.dump_json(data, path, 'pretty', backend)
+    assert path.read_text(encoding='utf-8') == json.dumps(data, indent=4)
+    t3_anonimize_json.dump_json(data, path, 'compact', backend)
+    assert path.read_text(encoding='utf-8') == \
+        '[{"name":null,"city":"Sofia","friends":[{"name":"Ана"}]},{"id":1}]'
+    t3_anonimize_json.dump_json(data, path, 'jsonl', backend)
+    lines = path.read_text(encoding='utf-8').splitlines()
+    assert [json.loads(line) for line in lines] == data
+
+@pytest.mark.parametrize("data", [
+    {"a": float('nan'), "b": [float('inf'), -float('inf')]},
+    {"big": 2 ** 70},
+    {1: "x", "nested": {2: [1.5]}},
+])
+def test_dump_json_auto_keeps_values(data):
+    """Test if the 'auto' backend writes the values which orjson cannot encode like json."""
+    output = io.StringIO()
+    t3_anonimize_json.dump_json(data, output, 'compact', 'auto')
+    assert output.getvalue() == json.dumps(data, separators=(',', ':'))
+
+def test_dump_json_orjson_rejects_values():
+    """Test if the 'orjson' backend rejects the values which it cannot encode exactly."""
+    pytest.importorskip('orjson')
+    with pytest.raises(ValueError, match="orjson cannot encode NaN and Infinity"):
+        t3_anonimize_json.dump_json([{"a": float('nan')}], io.StringIO(), 'jsonl', 'orjson')
+    with pytest.raises(TypeError):
+        t3_anonimize_json.dump_json({"big": 2 ** 70}, io.StringIO(), 'compact', 'orjson')
+
+def test_dump_json_without_orjson(monkeypatch):
+    """Test if the dump_json function falls back to json when orjson is not installed."""
+    monkeypatch.setattr(t3_anonimize_json, 'orjson', None)
+    output = io.StringIO()
+    t3_anonimize_json.dump_json({"a": [1, 2]}, output, 'compact')
+    assert output.getvalue() == '{"a":[1,2]}'
+    with pytest.raises(ValueError, match="orjson is not installed"):
+        t3_anonimize_json.dump_json({}, io.StringIO(), 'compact', 'orjson')
+    with pytest.raises(ValueError, match="style must be 'pretty', 'compact' or 'jsonl'"):
+        t3_anonimize_json.dump_json({}, io.StringIO(), 'indented')
+
+@pytest.mark.parametrize("style", ["pretty", "compact", "jsonl"])
+def test_anonimize_parallel_styles(style):
+    """Test if the anonimize_parallel function writes the records in every style."""
+    data = [{"name": "John", "friends": [{"name": "Alice"}]}, {"name": "Bob"}, {"id": 3}]
+    dst = io.StringIO()
+    t3_anonimize_json.anonimize_parallel(io.StringIO(json.dumps(data)), dst, workers=1,
+                                         batch_size=2, style=style)
+    t3_anonimize_json.anonimize(data)
+    if style == 'jsonl':
+        assert [json.loads(line) for line in dst.getvalue().splitlines()] == data
+    else:
+        assert json.loads(dst.getvalue()) == data
+    if style == 'pretty':
+        assert dst.getvalue() == json.dumps(data, indent=4)
+
+def test_pseudonymizer():
+    """Test if the Pseudonymizer class replaces equal values with equal
+    stable tokens and memoizes them."""
+    pseudonymizer = t3_anonimize_json.Pseudonymizer('secret', length=12, maxsize=2)
+    data = [{"name": "John", "friends": [{"name": "Alice"}, {"name": "John"}]},
+            {"name": "Alice", "friends": [{"name": None}]}]
+    assert t3_anonimize_json.anonimize(data, policy=pseudonymizer) == {'name': 5}
+    john, alice = data[0]["name"], data[1]["name"]
+    assert john == data[0]["friends"][1]["name"] and alice == data[0]["friends"][0]["name"]
+    assert john != alice and len(john) == 12
+    assert data[1]["friends"][0]["name"] is None
+    info = pseudonymizer.cache_info()
+    assert (info.hits, info.misses, info.maxsize) == (2, 2, 2)
+
+    assert t3_anonimize_json.Pseudonymizer('secret', length=12)("John") == john
+    assert t3_anonimize_json.Pseudonymizer('other', length=12)("John") != john
+    assert pseudonymizer(1) != pseudonymizer(True)
+    assert pickle.loads(pickle.dumps(pseudonymizer))("John") == john
+
+def test_pseudonymizer_value_error():
+    """Test if the Pseudonymizer class raises a ValueError for an empty key."""
+    with pytest.raises(ValueError, match="key must be a non-empty string or bytes"):
+        t3_anonimize_json.Pseudonymizer('')
+
+def test_anonimize_parallel_pseudonymizer(tmp_path):
+    """Test if the anonimize_parallel function gives the same tokens as anonimize."""
+    with open('data.json', mode='r', encoding='utf-8') as file:
+        expected = json.load(file)
+    t3_anonimize_json.anonimize(expected, policy=t3_anonimize_json.Pseudonymizer(b'key'))
+    target = tmp_path / 'anonimized.json'
+    t3_anonimize_json.anonimize_parallel('data.json', target, workers=2, batch_size=100,
+                                         policy=t3_anonimize_json.Pseudonymizer(b'key'))
+    with open(target, mode='r', encoding='utf-8') as file:
+        assert json.load(file) == expected
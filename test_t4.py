@@ -1,5 +1,7 @@
 """Test cases for the t4_decorators module."""
 
+import threading
+import pytest
 import t4_decorators
 
 def test_split_string():
@@ -22,3 +24,223 @@ def test_fil():
     def get_data():
         return ['THIS', 'IS', 'AN', 'EXAMPLE', 'STRING']
     assert get_data() == ['THIS', 'EXAMPLE', 'STRING']
+
+def test_decorators_with_arguments():
+    """Test if the decorators work for functions with arguments."""
+    @t4_decorators.fil
+    @t4_decorators.up
+    @t4_decorators.split_string
+    def get_data(text, suffix=''):
+        return text + suffix
+    assert get_data('This is An', suffix=' exAmPlE') == ['THIS', 'EXAMPLE']
+
+def test_pipeline_stages():
+    """Test if the stacked stages are fused into one Pipeline which
+    gives the same result as the decorators."""
+    @t4_decorators.fil_stage
+    @t4_decorators.up_stage
+    @t4_decorators.split_stage
+    def get_data(text):
+        """Returns the text"""
+        return text
+    assert isinstance(get_data, t4_decorators.Pipeline)
+    assert get_data.func.__name__ == 'get_data' and get_data.__doc__ == 'Returns the text'
+    assert len(get_data.steps) == 2
+    assert get_data('This is An exAmPlE StRinG') == ['THIS', 'EXAMPLE', 'STRING']
+
+def test_pipeline_lazy():
+    """Test if a lazy Pipeline returns an iterator."""
+    @t4_decorators.lazy
+    @t4_decorators.stage('map', lambda i: i * 2)
+    def get_numbers(n):
+        return range(n)
+    result = get_numbers(3)
+    assert next(result) == 0
+    assert list(result) == [2, 4]
+
+def test_stage_value_error():
+    """Test if a source stage which is not the first stage raises a ValueError."""
+    with pytest.raises(ValueError, match="a source stage must be the first stage"):
+        @t4_decorators.split_stage
+        @t4_decorators.up_stage
+        def get_data():
+            return ['a']
+    with pytest.raises(ValueError, match="kind must be 'source', 'map' or 'filter'"):
+        t4_decorators.stage('reduce', sum)
+
+def test_instrument():
+    """Test if the instrumentation decorators measure every decorator level."""
+    registry = t4_decorators.StatsRegistry()
+
+    @t4_decorators.timed(name='fil', registry=registry)
+    @t4_decorators.fil
+    @t4_decorators.track_memory(name='up', registry=registry)
+    @t4_decorators.up
+    @t4_decorators.counted(name='split', registry=registry)
+    @t4_decorators.split_string
+    def get_data():
+        return 'This is An exAmPlE StRinG' * 1000
+
+    for _ in range(3):
+        assert len(get_data()) > 0
+    assert [registry[name].calls for name in ('fil', 'up', 'split')] == [3, 3, 3]
+    assert registry['fil'].wall_time > 0 and registry['fil'].cpu_time > 0
+    assert registry['up'].peak_memory > 0 and registry['up'].wall_time == 0
+    assert registry['split'].wall_time == 0 and registry['split'].peak_memory == 0
+    assert 'fil' in registry.report()
+
+def test_track_memory_nested():
+    """Test if a nested traced call does not hide the peak of the outer call."""
+    registry = t4_decorators.StatsRegistry()
+
+    @t4_decorators.track_memory(name='inner', registry=registry)
+    def inner():
+        return 'small'
+
+    @t4_decorators.track_memory(name='outer', registry=registry)
+    def outer():
+        data = bytearray(20_000_000)
+        del data
+        return inner()
+
+    outer()
+    assert registry['outer'].peak_memory >= 20_000_000
+    assert registry['inner'].peak_memory < 1_000_000
+
+def test_profiled():
+    """Test if the profiled decorator captures the profile of the calls."""
+    registry = t4_decorators.StatsRegistry()
+
+    @t4_decorators.profiled(registry=registry)
+    def get_data():
+        return sorted(range(1000), key=lambda x: -x)
+
+    get_data()
+    assert 'sorted' in registry[get_data.__qualname__].profile_report()
+
+def test_profiled_nested():
+    """Test if a nested profiled call does not stop the outer profile."""
+    registry = t4_decorators.StatsRegistry()
+
+    @t4_decorators.profiled(name='inner', registry=registry)
+    def inner():
+        return 1
+
+    def after():
+        return sum(range(10))
+
+    @t4_decorators.profiled(name='outer', registry=registry)
+    def outer(depth=0):
+        inner()
+        if depth < 2:
+            outer(depth + 1)
+        return after()
+
+    outer()
+    report = registry['outer'].profile_report()
+    assert 'after' in report and 'sum' in report
+    assert registry['inner'].calls == 3 and registry['outer'].calls == 3
+    assert registry['inner'].profile_report() == ''
+
+def test_instrument_disabled(monkeypatch):
+    """Test if the instrumentation decorators return the function unchanged
+    when the instrumentation is turned off."""
+    monkeypatch.setenv('T4_INSTRUMENTATION', 'off')
+    registry = t4_decorators.StatsRegistry()
+
+    def get_data():
+        return 'data'
+    assert t4_decorators.timed(get_data, registry=registry) is get_data
+    assert t4_decorators.profiled(registry=registry)(get_data) is get_data
+    assert len(registry) == 0
+
+def test_cache_lru():
+    """Test if the cache decorator memoizes the results and evicts the
+    least recently used one when composed with the other decorators."""
+    calls = []
+
+    @t4_decorators.cache(maxsize=2)
+    @t4_decorators.fil
+    @t4_decorators.up
+    @t4_decorators.split_string
+    def get_data(text):
+        calls.append(text)
+        return text
+
+    assert get_data('This is An exAmPlE') == ['THIS', 'EXAMPLE']
+    assert get_data('This is An exAmPlE') == ['THIS', 'EXAMPLE']
+    get_data('StRinG')
+    get_data(text='This one')
+    get_data('StRinG')
+    get_data('This is An exAmPlE')
+    assert calls == ['This is An exAmPlE', 'StRinG', 'This one', 'This is An exAmPlE']
+    info = get_data.cache_info()
+    assert (info.hits, info.misses, info.maxsize, info.currsize) == (2, 4, 2, 2)
+    get_data.cache_clear()
+    assert get_data.cache_info().currsize == 0
+
+def test_cache_ttl(monkeypatch):
+    """Test if the cached results expire after the ttl."""
+    now = [100.0]
+    monkeypatch.setattr(t4_decorators.time, 'monotonic', lambda: now[0])
+
+    @t4_decorators.cache(ttl=10)
+    def get_data(n):
+        return [n] * n
+
+    first = get_data(2)
+    now[0] += 5
+    assert get_data(2) is first
+    now[0] += 6
+    assert get_data(2) is not first
+    assert get_data.cache_info().expired == 1
+
+def test_cache_unhashable_arguments():
+    """Test if calls with unhashable arguments are skipped or use the key function."""
+    @t4_decorators.cache
+    def count(words):
+        return len(words)
+
+    assert count(['a', 'b']) == 2
+    assert count.cache_info().skipped == 1
+
+    @t4_decorators.cache(key=tuple)
+    def count_words(words):
+        return len(words)
+
+    count_words(['a', 'b'])
+    count_words(['a', 'b'])
+    assert count_words.cache_info().hits == 1
+
+def test_cache_thread_safety():
+    """Test if the cache works when it is called from many threads."""
+    @t4_decorators.cache(maxsize=10)
+    def square(n):
+        return n * n
+
+    def work():
+        for i in range(1000):
+            assert square(i % 20) == (i % 20) ** 2
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    info = square.cache_info()
+    assert info.hits + info.misses == 8000 and info.currsize == 10
+
+def test_cache_value_error():
+    """Test if the cache decorator raises a ValueError for an invalid ttl."""
+    with pytest.raises(ValueError, match="ttl must be a positive number or None"):
+        t4_decorators.cache(ttl=0)
+
+def test_cache_keyword_arguments():
+    """Test if keyword arguments do not share a key with positional arguments."""
+    @t4_decorators.cache
+    def arguments(*args, **kwargs):
+        return args, kwargs
+
+    assert arguments(a=1) == ((), {'a': 1})
+    assert arguments((), (('a', 1),)) == (((), (('a', 1),)), {})
+    assert arguments(a=1) == ((), {'a': 1})
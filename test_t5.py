@@ -1,7 +1,12 @@
 """Test cases for the t5_dice_simulation module."""
 
+import os
+import subprocess
+import sys
 import t5_dice_simulation as t5
+import numpy as np
 import pytest
+from random_sampling import RandomStream
 
 def test_dice_roll():
     """Test if the roll method returns an integer between 1 and the number of sides."""
@@ -34,3 +39,178 @@ def test_simulation_run_value_error():
         t5.Simulation(2, -1)
         t5.Simulation(2, 1.5)
         t5.Simulation(2, "a")
+
+@pytest.mark.parametrize("engine", ["vectorized", "loop"])
+def test_simulation_run(engine):
+    """Test if the run method counts every roll within the possible results."""
+    sim = t5.Simulation(3, 5000, dice_sides=4)
+    sim.run(engine=engine, chunk_size=999)
+    assert list(sim.results) == list(range(3, 13))
+    assert sum(sim.results.values()) == 5000
+    # The middle results are more frequent than the extreme ones
+    assert sim.results[7] > sim.results[3] and sim.results[8] > sim.results[12]
+
+def test_simulation_run_vectorized_distribution():
+    """Test if the vectorized engine draws fair dice."""
+    sim = t5.Simulation(1, 60000)
+    sim.run()
+    for count in sim.results.values():
+        assert abs(count - 10000) < 500
+
+def test_simulation_run_engine_value_error():
+    """Test if the run method raises a ValueError for an unknown engine."""
+    with pytest.raises(ValueError, match="engine must be 'vectorized' or 'loop'"):
+        t5.Simulation(2, 10).run(engine='gpu')
+    with pytest.raises(ValueError, match="chunk_size must be a positive integer"):
+        t5.Simulation(2, 10).run(chunk_size=0)
+
+def test_sum_distribution_fair_dices():
+    """Test if the sum_distribution function returns the exact probabilities."""
+    distribution = t5.sum_distribution([6, 6])
+    assert list(distribution) == list(range(2, 13))
+    assert distribution[7] == pytest.approx(6 / 36)
+    assert distribution[2] == pytest.approx(1 / 36)
+    assert sum(distribution.values()) == pytest.approx(1)
+
+def test_sum_distribution_mixed_and_weighted_dices():
+    """Test if the sum_distribution function supports different sides and weights."""
+    distribution = t5.sum_distribution([t5.Dice(4), 6])
+    assert list(distribution) == list(range(2, 11))
+    assert distribution[2] == pytest.approx(1 / 24)
+    assert distribution[5] == pytest.approx(4 / 24)
+    # The first dice always shows 2
+    distribution = t5.sum_distribution([[0, 1], [2, 2, 2]])
+    assert distribution == pytest.approx({2: 0, 3: 1 / 3, 4: 1 / 3, 5: 1 / 3})
+
+def test_sum_distribution_many_dices():
+    """Test if the FFT convolution of many dices matches the direct convolution."""
+    distribution = t5.sum_distribution([6] * 1000)
+    assert sum(distribution.values()) == pytest.approx(1)
+    mean = sum(k * p for k, p in distribution.items())
+    assert mean == pytest.approx(3500)
+    direct = np.ones(1)
+    for _ in range(60):
+        direct = np.convolve(direct, np.full(6, 1 / 6))
+    assert list(t5.sum_distribution([6] * 60).values()) == pytest.approx(list(direct), abs=1e-12)
+
+def test_simulation_exact_distribution():
+    """Test if the exact distribution is close to the simulated one."""
+    sim = t5.Simulation(2, 100_000)
+    sim.run()
+    for result, probability in sim.exact_distribution().items():
+        assert abs(sim.results[result] / 100_000 - probability) < 0.01
+
+def test_sum_distribution_value_error():
+    """Test if the sum_distribution function raises a ValueError for invalid weights."""
+    with pytest.raises(ValueError, match="weights must be non-negative numbers with a positive sum"):
+        t5.sum_distribution([[1, -1, 2]])
+    with pytest.raises(ValueError, match="at least one dice is required"):
+        t5.sum_distribution([])
+
+def test_simulation_run_workers_reproducible():
+    """Test if the results for a fixed seed do not depend on the number of workers."""
+    results = []
+    for workers in (1, 2, 3):
+        sim = t5.Simulation(3, 10_000, seed=2024)
+        sim.run(chunk_size=3000, workers=workers)
+        results.append(sim.results)
+    assert results[0] == results[1] == results[2]
+    assert sum(results[0].values()) == 10_000
+
+def test_simulation_runs_use_new_rolls():
+    """Test if every run of a seeded simulation draws new rolls, reproducibly."""
+    sim1 = t5.Simulation(2, 1000, seed=1)
+    sim2 = t5.Simulation(2, 1000, seed=1)
+    sim1.run()
+    first = dict(sim1.results)
+    sim1.run()
+    sim2.run()
+    sim2.run()
+    assert sim1.results == sim2.results
+    assert sim1.results != {k: 2 * v for k, v in first.items()}
+
+def test_simulation_run_workers_value_error():
+    """Test if the run method raises a ValueError for an invalid number of workers."""
+    with pytest.raises(ValueError, match="workers must be a positive integer"):
+        t5.Simulation(2, 10).run(workers=0)
+
+def test_simulation_str():
+    """Test if the __str__ method returns the results as text."""
+    sim = t5.Simulation(1, 10, dice_sides=2)
+    sim.results = {1: 4, 2: 6}
+    assert str(sim) == '1 -> 4 times\n2 -> 6 times'
+
+@pytest.mark.parametrize("name, fmt, header", [
+    ('chart.png', None, b'\x89PNG'),
+    ('chart.svg', None, b'<?xml'),
+    ('chart.out', 'SVG', b'<?xml'),
+])
+def test_simulation_plot(tmp_path, name, fmt, header):
+    """Test if the plot method saves the chart in the given format."""
+    sim = t5.Simulation(2, 100, seed=3)
+    sim.run()
+    path = sim.plot(tmp_path / name, fmt)
+    with open(path, 'rb') as file:
+        assert file.read().startswith(header)
+
+def test_simulation_plot_value_error(tmp_path):
+    """Test if the plot method raises a ValueError for an unsupported format."""
+    with pytest.raises(ValueError, match="fmt must be 'png' or 'svg'"):
+        t5.Simulation(2, 10).plot(tmp_path / 'chart.jpg')
+
+def test_import_does_not_load_matplotlib():
+    """Test if importing the module does not import matplotlib."""
+    code = "import sys, t5_dice_simulation; print('matplotlib' in sys.modules)"
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True,
+                            text=True, check=True, cwd=os.path.dirname(t5.__file__))
+    assert output.stdout.strip() == 'False'
+
+def test_dice_weighted_roll():
+    """Test if a loaded dice rolls its sides with the given weights."""
+    dice = t5.Dice(weights=[0, 1, 3])
+    assert dice.sides == 3
+    rolls = [dice.roll() for _ in range(4000)]
+    assert 1 not in rolls
+    assert rolls.count(3) / len(rolls) == pytest.approx(0.75, abs=0.03)
+    many = dice.roll_many(40_000, RandomStream(5))
+    assert many.min() >= 2 and many.max() <= 3
+    assert (many == 3).mean() == pytest.approx(0.75, abs=0.01)
+    assert dice.roll_many((10, 4)).shape == (10, 4)
+
+@pytest.mark.parametrize("weights", [[1, 2, 3, 4], [0.5, 0.1, 0.1, 0.1, 0.1, 0.1], [5, 0, 0, 1]])
+def test_dice_alias_tables(weights):
+    """Test if the alias tables give back the probabilities of the sides."""
+    dice = t5.Dice(weights=weights)
+    n = dice.sides
+    probabilities = np.array(dice._prob) / n
+    np.add.at(probabilities, dice._alias, (1 - np.array(dice._prob)) / n)
+    assert probabilities == pytest.approx(dice.probabilities)
+
+def test_dice_weighted_value_error():
+    """Test if the Dice class raises a ValueError for invalid weights."""
+    with pytest.raises(ValueError, match="weights must be non-negative"):
+        t5.Dice(weights=[1, -1])
+    with pytest.raises(ValueError, match="weights must be non-negative"):
+        t5.Dice(weights=[0, 0])
+    with pytest.raises(ValueError, match="the number of weights must be equal to sides"):
+        t5.Dice(4, weights=[1, 2, 3])
+    with pytest.raises(ValueError, match="sides must be an integer greater than 1"):
+        t5.Dice(weights=[1])
+
+@pytest.mark.parametrize("engine", ['vectorized', 'loop'])
+def test_simulation_from_dices(engine):
+    """Test if a simulation with different and loaded dices covers their range."""
+    sim = t5.Simulation.from_dices([4, t5.Dice(weights=[0, 0, 0, 0, 0, 1]), t5.Dice(2)], 3000, seed=9)
+    assert sim.dice_sides is None
+    assert list(sim.results) == list(range(3, 13))
+    sim.run(engine=engine)
+    assert sum(sim.results.values()) == 3000
+    # The loaded dice always shows 6
+    assert all(sim.results[k] == 0 for k in range(3, 8))
+    for result, probability in sim.exact_distribution().items():
+        assert sim.results[result] / 3000 == pytest.approx(probability, abs=0.04)
+
+def test_simulation_from_dices_value_error():
+    """Test if from_dices raises a ValueError without dices."""
+    with pytest.raises(ValueError):
+        t5.Simulation.from_dices([], 10)
@@ -2,6 +2,7 @@
 
 import t6_datasets as t6
 import pandas as pd
+import pytest
 
 def test_CSVDataset_with_mocker(mocker):
     """Test if the CSVDataset class reads the CSV file correctly
@@ -26,3 +27,117 @@ def test_CSVDataset_with_mocker(mocker):
     assert dataset.data.equals(pd.DataFrame({"a": [1, 2, 3], "b": [4, 5, 6]}))
     mocker_transform_data.assert_called_once()
     mocker_to_csv.assert_called_once_with("test_target.csv")
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "source.csv"
+    pd.DataFrame({"a": range(10),
+                  "b": [None] * 10,
+                  "c": ["x"] * 9 + [None],
+                  "d": [1.5] * 10}).to_csv(path, index=False)
+    return path
+
+def test_CSVDataset_chunked(source, tmp_path):
+    """Test if the chunked CSVDataset writes the same data as the whole DataFrame."""
+    eager = t6.CSVDataset(source, tmp_path / "eager.csv")
+    eager.save_data()
+    chunked = t6.CSVDataset(source, tmp_path / "chunked.csv", chunksize=3)
+    chunked.save_data()
+    assert chunked._data is None
+
+    expected = pd.read_csv(tmp_path / "eager.csv", index_col=0)
+    result = pd.read_csv(tmp_path / "chunked.csv", index_col=0)
+    assert list(result.columns) == ["a", "d", "timestamp"]
+    assert list(result.index) == list(range(10))
+    assert result.drop(columns="timestamp").equals(expected.drop(columns="timestamp"))
+    assert result["timestamp"].nunique() == 1
+
+def test_CSVDataset_chunked_value_error(source, tmp_path):
+    """Test if the CSVDataset class raises a ValueError for an invalid chunksize."""
+    for chunksize in (0, -1, 2.5):
+        with pytest.raises(ValueError, match="chunksize must be a positive integer"):
+            t6.CSVDataset(source, tmp_path / "target.csv", chunksize=chunksize)
+
+def test_CSVDataset_lazy(mocker):
+    """Test if the CSVDataset reads the file only on the first access of the data."""
+    mocker_read_csv = mocker.patch("pandas.read_csv",
+                                   return_value=pd.DataFrame({"a": [1, 2], "b": [None, None]}))
+    dataset = t6.CSVDataset("test_source.csv", "test_target.csv")
+    assert repr(dataset) == "Data is fetched from 'test_source.csv' on the first access"
+    mocker_read_csv.assert_not_called()
+
+    assert list(dataset.data.columns) == ["a", "timestamp"]
+    assert list(dataset.data.columns) == ["a", "timestamp"]
+    mocker_read_csv.assert_called_once_with("test_source.csv")
+    assert repr(dataset).startswith("Data is fetched from 'test_source.csv':\n")
+
+def test_CSVDataset_steps(source, tmp_path):
+    """Test if the added steps are applied once to the data or to every chunk."""
+    calls = []
+    def double(data):
+        calls.append(len(data))
+        return data.assign(a=data["a"] * 2)
+
+    dataset = t6.CSVDataset(source, tmp_path / "target.csv")
+    dataset.add_step(double)
+    assert dataset.data["a"].tolist() == [2 * i for i in range(10)]
+    assert dataset.data["a"].tolist() == [2 * i for i in range(10)]
+    assert calls == [10]
+    # A step added to loaded data is applied immediately
+    dataset.add_step(lambda data: data.head(2))
+    assert len(dataset.data) == 2
+
+    chunked = t6.CSVDataset(source, tmp_path / "chunked.csv", chunksize=4)
+    chunked.add_step(double)
+    chunked.save_data()
+    assert chunked._data is None
+    assert calls == [10, 4, 4, 2]
+    result = pd.read_csv(tmp_path / "chunked.csv", index_col=0)
+    assert result["a"].tolist() == [2 * i for i in range(10)]
+
+def test_CSVDataset_global_step(source, tmp_path):
+    """Test if a step which needs the whole data prevents saving in chunks."""
+    dataset = t6.CSVDataset(source, tmp_path / "target.csv", chunksize=3)
+    dataset.add_step(lambda data: data.sort_values("a", ascending=False), chunkwise=False)
+    dataset.save_data()
+    assert dataset._data is not None
+    result = pd.read_csv(tmp_path / "target.csv", index_col=0)
+    assert result["a"].tolist() == list(range(9, -1, -1))
+    assert list(result.index) == list(range(9, -1, -1))
+
+def test_CSVDataset_chunked_dtypes(tmp_path):
+    """Test if the chunked CSVDataset writes the values with the dtypes of the whole file."""
+    source = tmp_path / "source.csv"
+    source.write_text("a,b,c,d,e\n1,x,True,True,1\n2,y,False,False,2\n"
+                      "3.5,1,True,3,True\n4.5,2,False,5,False\n5,z,True,6,True\n")
+    eager = t6.CSVDataset(source, tmp_path / "eager.csv")
+    eager.save_data()
+    chunked = t6.CSVDataset(source, tmp_path / "chunked.csv", chunksize=2)
+    chunked.save_data()
+
+    expected = (tmp_path / "eager.csv").read_text().splitlines()
+    result = (tmp_path / "chunked.csv").read_text().splitlines()
+    assert [line.rsplit(",", 1)[0] for line in result] == \
+        [line.rsplit(",", 1)[0] for line in expected]
+    assert result[1].startswith("0,1.0,x,True,True,1,")
+    assert [line.split(",")[5] for line in result[1:]] == ["1", "2", "True", "False", "True"]
+
+def test_CSVDataset_failed_step(source, tmp_path):
+    """Test if a failed step does not leave half processed data."""
+    failures = [ValueError("failed")]
+    def fail_once(data):
+        if failures:
+            raise failures.pop()
+        return data.assign(a=data["a"] + 1)
+
+    dataset = t6.CSVDataset(source, tmp_path / "target.csv")
+    dataset.add_step(fail_once)
+    with pytest.raises(ValueError, match="failed"):
+        dataset.data
+    assert dataset._data is None
+    assert dataset.data["a"].tolist() == list(range(1, 11))
+
+    # A step failing on loaded data is not recorded
+    with pytest.raises(ZeroDivisionError):
+        dataset.add_step(lambda data: 1 / 0)
+    assert len(dataset._steps) == 1
@@ -1,5 +1,6 @@
 """Test cases for the t7_op_overloading module."""
 import t7_op_overloading as t7
+import numpy as np
 import pytest
 
 @pytest.fixture
@@ -65,3 +66,161 @@ def test_distance_subtraction_negative(distance):
     distance2 = t7.Distance(3, 21, 20)
     with pytest.raises(ValueError, match="Resulting distance cannot be negative"):
         res = distance - distance2
+
+def test_distance_isubtraction_negative(distance):
+    """Test if a failed in-place subtraction leaves the distance unchanged."""
+    with pytest.raises(ValueError, match="Resulting distance cannot be negative"):
+        distance -= t7.Distance(3, 21, 20)
+    assert distance.total_milimeters == 3033
+
+def test_distance_setters(distance):
+    """Test if setting a component keeps the others and distributes the result."""
+    distance.meters = 5
+    assert str(distance) == "5m 3cm 3mm"
+    distance.centimeters = 150
+    assert str(distance) == "6m 50cm 3mm"
+    distance.milimeters = 12
+    assert str(distance) == "6m 51cm 2mm"
+    distance.total_milimeters = 7
+    assert str(distance) == "0m 0cm 7mm"
+    with pytest.raises(ValueError,
+                       match="meters, centimeters and milimeters must be non-negative integers"):
+        distance.centimeters = -1
+
+def test_distance_slots(distance):
+    """Test if the distance has no instance dict and a single field."""
+    assert not hasattr(distance, '__dict__')
+    with pytest.raises(AttributeError):
+        distance.unit = 'm'
+
+@pytest.fixture
+def distances():
+    return t7.DistanceArray([3033, 1213, 0, 5])
+
+def test_distance_array_value_error():
+    """Test if the DistanceArray class raises a ValueError for invalid milimeters."""
+    for values in ([1, -1], [1.5], [[1, 2]], ['a'], [True]):
+        with pytest.raises(ValueError, match="milimeters must be a sequence of non-negative integers"):
+            t7.DistanceArray(values)
+    assert len(t7.DistanceArray()) == 0
+
+def test_distance_array_conversion(distances):
+    """Test if the DistanceArray converts from and to Distance objects."""
+    objects = distances.to_distances()
+    assert [str(d) for d in objects] == ["3m 3cm 3mm", "1m 21cm 3mm", "0m 0cm 0mm", "0m 0cm 5mm"]
+    array = t7.DistanceArray.from_distances(objects)
+    assert array.total_milimeters.tolist() == [3033, 1213, 0, 5]
+    assert [d.total_milimeters for d in array] == [3033, 1213, 0, 5]
+    assert array[1].total_milimeters == 1213
+    assert array[1:3].total_milimeters.tolist() == [1213, 0]
+    assert array.meters.tolist() == [3, 1, 0, 0]
+    assert array.centimeters.tolist() == [3, 21, 0, 0]
+    assert array.milimeters.tolist() == [3, 3, 0, 5]
+    assert str(array) == "[3m 3cm 3mm, 1m 21cm 3mm, 0m 0cm 0mm, 0m 0cm 5mm]"
+
+def test_distance_array_arithmetic(distances):
+    """Test if the DistanceArray operators work elementwise and with scalars."""
+    other = t7.DistanceArray([33, 13, 0, 5])
+    assert (distances + other).total_milimeters.tolist() == [3066, 1226, 0, 10]
+    assert (distances - other).total_milimeters.tolist() == [3000, 1200, 0, 0]
+    assert (distances + t7.Distance(0, 0, 5)).total_milimeters.tolist() == [3038, 1218, 5, 10]
+    assert (t7.Distance(0, 0, 5) + distances).total_milimeters.tolist() == [3038, 1218, 5, 10]
+    assert (t7.Distance(4, 0, 0) - distances).total_milimeters.tolist() == [967, 2787, 4000, 3995]
+    assert (2 * distances).total_milimeters.tolist() == [6066, 2426, 0, 10]
+    view = distances[:2]
+    view += other[:2]
+    assert view.total_milimeters.tolist() == [3066, 1226]
+    assert distances.total_milimeters.tolist() == [3033, 1213, 0, 5]
+
+def test_distance_array_negative(distances):
+    """Test if negative results are rejected for the whole array."""
+    with pytest.raises(ValueError, match="Resulting distance cannot be negative"):
+        distances - t7.Distance(0, 0, 1)
+    with pytest.raises(ValueError, match="Resulting distance cannot be negative"):
+        distances -= t7.DistanceArray([0, 0, 0, 6])
+    assert distances.total_milimeters.tolist() == [3033, 1213, 0, 5]
+    with pytest.raises(ValueError, match="DistanceArrays must have the same length"):
+        distances + t7.DistanceArray([1])
+    with pytest.raises(TypeError):
+        distances * 1.5
+
+def test_distance_array_reductions(distances):
+    """Test if the reductions return Distance objects and cumsum an array."""
+    assert str(distances.sum()) == "4m 25cm 1mm"
+    assert str(distances.min()) == "0m 0cm 0mm"
+    assert str(distances.max()) == "3m 3cm 3mm"
+    assert distances.cumsum().total_milimeters.tolist() == [3033, 4246, 4246, 4251]
+    with pytest.raises(ValueError):
+        t7.DistanceArray().max()
+
+def test_distance_sum(distance):
+    """Test if the builtin sum and Distance.sum add the distances."""
+    distances = [distance, t7.Distance(1, 21, 20), t7.Distance(0, 0, 7)]
+    assert str(sum(distances)) == "4m 27cm 0mm"
+    assert str(t7.Distance.sum(distances)) == "4m 27cm 0mm"
+    assert str(t7.Distance.sum(iter(distances))) == "4m 27cm 0mm"
+    assert str(t7.Distance.sum([])) == "0m 0cm 0mm"
+    assert str(t7.Distance.sum(t7.DistanceArray.from_distances(distances))) == "4m 27cm 0mm"
+    # sum returns a new object
+    assert sum([distance]) is not distance
+    with pytest.raises(TypeError):
+        1 + distance
+
+def test_distance_comparison(distance):
+    """Test if the distances are compared by their total milimeters."""
+    assert distance == t7.Distance(3, 3, 3)
+    assert distance != t7.Distance(3, 3, 4)
+    assert t7.Distance(0, 99, 9) < t7.Distance(1, 0, 0) <= t7.Distance(0, 100, 0)
+    assert t7.Distance(2, 0, 0) > t7.Distance(1, 99, 9) >= t7.Distance(1, 99, 9)
+    assert distance != 3033
+    assert sorted([t7.Distance(2, 0, 0), t7.Distance(0, 5, 0), t7.Distance(1, 0, 0)]) == \
+        [t7.Distance(0, 5, 0), t7.Distance(1, 0, 0), t7.Distance(2, 0, 0)]
+    with pytest.raises(TypeError):
+        distance < 5
+
+def test_distance_hash(distance):
+    """Test if equal distances have the same hash."""
+    assert len({distance, t7.Distance(3, 3, 3), t7.Distance(0, 0, 3033), t7.Distance(0, 0, 1)}) == 2
+    lengths = {t7.Distance(1, 0, 0): 'one meter'}
+    assert lengths[t7.Distance(0, 100, 0)] == 'one meter'
+
+def test_distance_array_unsigned():
+    """Test if unsigned numpy values keep the milimeters int64 and valid."""
+    with pytest.raises(ValueError, match="milimeters must be a sequence of non-negative integers"):
+        t7.DistanceArray(np.array([2**63], dtype=np.uint64))
+    array = t7.DistanceArray(np.array([1, 12], dtype=np.uint64))
+    result = array * np.uint64(2)
+    assert result.total_milimeters.dtype == np.int64
+    assert str(result) == "[0m 0cm 2mm, 0m 2cm 4mm]"
+    assert (np.uint8(3) * array).total_milimeters.tolist() == [3, 36]
+    with pytest.raises(ValueError, match="Resulting distance is too long"):
+        t7.DistanceArray([2**62]) * 4
+
+def test_distance_inplace_with_array(distances):
+    """Test if += and -= of a Distance and a DistanceArray fall back to the array."""
+    distance = t7.Distance(0, 1, 0)
+    distance += distances
+    assert distance.total_milimeters.tolist() == [3043, 1223, 10, 15]
+    distance = t7.Distance(4, 0, 0)
+    distance -= distances
+    assert distance.total_milimeters.tolist() == [967, 2787, 4000, 3995]
+
+def test_distance_array_overflow():
+    """Test if sums above the int64 range are rejected instead of wrapping."""
+    array = t7.DistanceArray([2**62, 1])
+    for operation in (lambda: array + array, lambda: t7.Distance(0, 0, 2**62) + array,
+                      lambda: array + t7.Distance(0, 0, 2**64)):
+        with pytest.raises(ValueError, match="Resulting distance is too long"):
+            operation()
+    with pytest.raises(ValueError, match="Resulting distance is too long"):
+        array += array
+    assert array.total_milimeters.tolist() == [2**62, 1]
+
+    array = t7.DistanceArray([2**62, 2**62])
+    assert array.sum().total_milimeters == 2**63
+    with pytest.raises(ValueError, match="Resulting distance is too long"):
+        array.cumsum()
+    # large values whose sum still fits
+    array = t7.DistanceArray([2**62, 2**62 - 1])
+    assert array.sum().total_milimeters == 2**63 - 1
+    assert array.cumsum().total_milimeters.tolist() == [2**62, 2**63 - 1]